@@ -0,0 +1,513 @@
+"""Offline bulk roasting through provider batch-job APIs.
+
+Many roast prompts are packaged into a single OpenAI Batch or Anthropic
+Message Batches job. Jobs are tracked locally so they can be polled and
+collected later, and completed roasts are written to the result store.
+"""
+
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from code_roaster.cache import ResultStore
+from code_roaster.config import Config
+from code_roaster.roaster import CodeRoaster
+
+# Providers whose APIs support batch jobs
+BATCH_PROVIDERS = ("openai", "anthropic")
+
+# Largest number of requests packed into a single job
+MAX_BATCH_REQUESTS = 10000
+
+# Anthropic requires an output cap; this matches ChatAnthropic's default
+ANTHROPIC_DEFAULT_MAX_TOKENS = 1024
+
+# Normalized job statuses
+PENDING = "pending"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class BatchBackend(ABC):
+    """A provider's batch-job API."""
+
+    def __init__(
+        self,
+        api_endpoint: str,
+        api_key: Optional[str],
+        model_name: str,
+        max_tokens: Optional[int] = None,
+        stop: Optional[List[str]] = None,
+        timeout: float = 60.0,
+    ):
+        """Initialize the batch backend.
+
+        Args:
+            api_endpoint: The provider's API endpoint
+            api_key: The provider's API key
+            model_name: The model used for every request in the job
+            max_tokens: Optional cap on the number of output tokens
+            stop: Optional stop sequences that end generation early
+            timeout: HTTP timeout in seconds for each API call
+        """
+        self.api_endpoint = api_endpoint.rstrip("/")
+        self.api_key = api_key
+        self.model_name = model_name
+        self.max_tokens = max_tokens
+        self.stop = stop
+        self.client = httpx.Client(timeout=timeout, headers=self._headers())
+
+    @abstractmethod
+    def _headers(self) -> Dict[str, str]:
+        """Get the authentication headers for the API."""
+
+    @abstractmethod
+    def submit(self, requests: List[Tuple[str, str]]) -> str:
+        """Submit a batch job.
+
+        Args:
+            requests: (custom ID, prompt) pairs
+
+        Returns:
+            The provider's job ID
+        """
+
+    @abstractmethod
+    def status(self, job_id: str) -> str:
+        """Get a job's status.
+
+        Args:
+            job_id: The provider's job ID
+
+        Returns:
+            PENDING, COMPLETED or FAILED
+        """
+
+    @abstractmethod
+    def results(self, job_id: str) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        """Download the results of a completed job.
+
+        Args:
+            job_id: The provider's job ID
+
+        Returns:
+            A mapping of custom ID to (roast, error); exactly one is set
+        """
+
+    def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send an API request and raise on HTTP errors."""
+        response = self.client.request(method, url, **kwargs)
+        if response.is_error:
+            raise ValueError(
+                f"Batch API request failed ({response.status_code}): {response.text}"
+            )
+        return response
+
+    @staticmethod
+    def _jsonl(text: str) -> List[dict]:
+        """Parse a JSON Lines document."""
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """OpenAI Batch API: a JSONL input file plus a batch over chat completions."""
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"}
+
+    def submit(self, requests: List[Tuple[str, str]]) -> str:
+        lines = []
+        for custom_id, prompt in requests:
+            body = {
+                "model": self.model_name,
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": 0.7,
+            }
+            if self.max_tokens is not None:
+                body["max_tokens"] = self.max_tokens
+            if self.stop:
+                body["stop"] = self.stop
+            lines.append(
+                json.dumps(
+                    {
+                        "custom_id": custom_id,
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": body,
+                    }
+                )
+            )
+
+        upload = self._request(
+            "POST",
+            f"{self.api_endpoint}/files",
+            data={"purpose": "batch"},
+            files={"file": ("roasts.jsonl", "\n".join(lines).encode("utf-8"))},
+        ).json()
+        batch = self._request(
+            "POST",
+            f"{self.api_endpoint}/batches",
+            json={
+                "input_file_id": upload["id"],
+                "endpoint": "/v1/chat/completions",
+                "completion_window": "24h",
+            },
+        ).json()
+        return batch["id"]
+
+    def _batch(self, job_id: str) -> dict:
+        return self._request("GET", f"{self.api_endpoint}/batches/{job_id}").json()
+
+    def status(self, job_id: str) -> str:
+        status = self._batch(job_id)["status"]
+        if status == "completed":
+            return COMPLETED
+        if status in ("failed", "expired", "cancelled"):
+            return FAILED
+        return PENDING
+
+    def results(self, job_id: str) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        batch = self._batch(job_id)
+        results: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        for file_key in ("output_file_id", "error_file_id"):
+            file_id = batch.get(file_key)
+            if not file_id:
+                continue
+            content = self._request(
+                "GET", f"{self.api_endpoint}/files/{file_id}/content"
+            ).text
+            for line in self._jsonl(content):
+                response = line.get("response") or {}
+                if line.get("error") or response.get("status_code", 200) >= 400:
+                    error = line.get("error") or response.get("body", {}).get("error")
+                    results[line["custom_id"]] = (None, str(error))
+                else:
+                    message = response["body"]["choices"][0]["message"]
+                    results[line["custom_id"]] = (message.get("content") or "", None)
+        return results
+
+
+class AnthropicBatchBackend(BatchBackend):
+    """Anthropic Message Batches API."""
+
+    def _headers(self) -> Dict[str, str]:
+        return {"x-api-key": self.api_key or "", "anthropic-version": "2023-06-01"}
+
+    def submit(self, requests: List[Tuple[str, str]]) -> str:
+        batch_requests = []
+        for custom_id, prompt in requests:
+            params = {
+                "model": self.model_name,
+                "max_tokens": self.max_tokens or ANTHROPIC_DEFAULT_MAX_TOKENS,
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": 0.7,
+            }
+            if self.stop:
+                params["stop_sequences"] = self.stop
+            batch_requests.append({"custom_id": custom_id, "params": params})
+
+        batch = self._request(
+            "POST",
+            f"{self.api_endpoint}/v1/messages/batches",
+            json={"requests": batch_requests},
+        ).json()
+        return batch["id"]
+
+    def _batch(self, job_id: str) -> dict:
+        return self._request(
+            "GET", f"{self.api_endpoint}/v1/messages/batches/{job_id}"
+        ).json()
+
+    def status(self, job_id: str) -> str:
+        # Individual requests can still fail in an ended batch; see results()
+        return (
+            COMPLETED
+            if self._batch(job_id)["processing_status"] == "ended"
+            else PENDING
+        )
+
+    def results(self, job_id: str) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        results_url = self._batch(job_id).get("results_url")
+        if not results_url:
+            raise ValueError(f"Batch {job_id} has no results yet")
+
+        results: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        for line in self._jsonl(self._request("GET", results_url).text):
+            result = line["result"]
+            if result["type"] == "succeeded":
+                text = "".join(
+                    block.get("text", "")
+                    for block in result["message"]["content"]
+                    if block.get("type") == "text"
+                )
+                results[line["custom_id"]] = (text, None)
+            else:
+                results[line["custom_id"]] = (
+                    None,
+                    str(result.get("error") or result["type"]),
+                )
+        return results
+
+
+def get_batch_backend(
+    provider_name: str,
+    api_endpoint: Optional[str] = None,
+    model_name: Optional[str] = None,
+    max_tokens: Optional[int] = None,
+    stop: Optional[List[str]] = None,
+) -> BatchBackend:
+    """Get a batch backend for a provider.
+
+    Args:
+        provider_name: The name of the LLM provider
+        api_endpoint: Optional custom API endpoint
+        model_name: Optional model name to use
+        max_tokens: Optional cap on the number of output tokens
+        stop: Optional stop sequences that end generation early
+
+    Returns:
+        The provider's batch backend
+
+    Raises:
+        ValueError: If the provider has no batch API
+    """
+    backends = {
+        "openai": OpenAIBatchBackend,
+        "anthropic": AnthropicBatchBackend,
+    }
+    backend_class = backends.get(provider_name.lower())
+    if not backend_class:
+        raise ValueError(
+            f"Batch mode is not supported for provider: {provider_name} "
+            f"(supported: {', '.join(BATCH_PROVIDERS)})"
+        )
+
+    return backend_class(
+        api_endpoint=Config.get_api_endpoint(provider_name, api_endpoint),
+        api_key=Config.get_api_key(provider_name),
+        model_name=Config.get_model(provider_name, model_name),
+        max_tokens=max_tokens,
+        stop=stop,
+    )
+
+
+class BatchJobStore:
+    """Local records of submitted batch jobs, one JSON file per job."""
+
+    def __init__(self, directory: Optional[Path] = None):
+        """Initialize the job store.
+
+        Args:
+            directory: Optional directory for job records; defaults to
+                batches/ in the cache directory
+        """
+        self.directory = directory or Config.get_cache_dir() / "batches"
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, job_id: str) -> Path:
+        return self.directory / f"{job_id}.json"
+
+    def save(self, job: dict) -> None:
+        """Save a job record."""
+        with open(self._path(job["id"]), "w", encoding="utf-8") as file:
+            json.dump(job, file, indent=2)
+
+    def load(self, job_id: str) -> dict:
+        """Load a job record.
+
+        Raises:
+            ValueError: If no job with that ID is tracked
+        """
+        try:
+            with open(self._path(job_id), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            raise ValueError(f"Unknown batch job: {job_id}") from None
+
+    def remove(self, job_id: str) -> None:
+        """Stop tracking a job."""
+        self._path(job_id).unlink(missing_ok=True)
+
+    def list(self) -> List[dict]:
+        """Load every tracked job, oldest first."""
+        jobs = [self.load(path.stem) for path in self.directory.glob("*.json")]
+        return sorted(jobs, key=lambda job: job["submitted_at"])
+
+
+class BatchRunner:
+    """Submit, poll and collect batch roasting jobs."""
+
+    def __init__(
+        self,
+        roaster: CodeRoaster,
+        provider_name: str,
+        api_endpoint: Optional[str] = None,
+        store: Optional[ResultStore] = None,
+        jobs: Optional[BatchJobStore] = None,
+    ):
+        """Initialize the batch runner.
+
+        Args:
+            roaster: The code roaster used to build prompts; its provider's
+                model and limits are used for the batch requests
+            provider_name: The name of the LLM provider
+            api_endpoint: Optional custom API endpoint
+            store: Optional result store; defaults to the shared cache
+            jobs: Optional job store; defaults to the shared cache
+        """
+        self.roaster = roaster
+        self.llm_provider = roaster.llm_provider
+        self.provider_name = provider_name.lower()
+        self.backend = get_batch_backend(
+            self.provider_name,
+            api_endpoint=api_endpoint,
+            model_name=self.llm_provider.get_model_name,
+            max_tokens=self.llm_provider.max_tokens,
+            stop=self.llm_provider.stop,
+        )
+        self.store = store or ResultStore()
+        self.jobs = jobs or BatchJobStore()
+        self._backends: Dict[Tuple[str, str], BatchBackend] = {
+            (self.backend.api_endpoint, self.backend.model_name): self.backend
+        }
+
+    def submit(self, paths: Sequence[str]) -> Tuple[List[dict], int, int]:
+        """Submit roasts for the code files under the given paths.
+
+        Files whose roast is already in the result store, or whose prompt is
+        waiting in a tracked pending job, are skipped.
+
+        Args:
+            paths: Files and directories to roast
+
+        Returns:
+            The submitted job records, the number of files skipped because
+            their roast is stored, and the number skipped because they are
+            already in a pending job
+        """
+        in_flight_keys = {
+            entry["key"]
+            for job in self.jobs.list()
+            if job["status"] == PENDING
+            for entry in job["requests"].values()
+        }
+        pending = []
+        stored = 0
+        in_flight = 0
+        for file_path in CodeRoaster.find_code_files(paths):
+            code_content = CodeRoaster.read_code_file(file_path)
+            language = CodeRoaster.detect_language(file_path)
+            prompt = self.roaster.build_prompt(code_content, language)
+            key = self.store.key(self.llm_provider, prompt)
+            if self.store.get(key) is not None:
+                stored += 1
+                continue
+            if key in in_flight_keys:
+                in_flight += 1
+                continue
+            in_flight_keys.add(key)
+            pending.append((os.path.abspath(file_path), language, key, prompt))
+
+        submitted = []
+        for offset in range(0, len(pending), MAX_BATCH_REQUESTS):
+            chunk = pending[offset : offset + MAX_BATCH_REQUESTS]
+            requests = {
+                f"roast-{offset + index}": entry for index, entry in enumerate(chunk)
+            }
+            job_id = self.backend.submit(
+                [(custom_id, entry[3]) for custom_id, entry in requests.items()]
+            )
+            job = {
+                "id": job_id,
+                "provider": self.provider_name,
+                "model": self.backend.model_name,
+                "api_endpoint": self.backend.api_endpoint,
+                "submitted_at": time.time(),
+                "status": PENDING,
+                "requests": {
+                    custom_id: {
+                        "file_path": file_path,
+                        "language": language,
+                        "key": key,
+                    }
+                    for custom_id, (file_path, language, key, _) in requests.items()
+                },
+            }
+            self.jobs.save(job)
+            submitted.append(job)
+        return submitted, stored, in_flight
+
+    def poll(self, job_ids: Optional[Sequence[str]] = None) -> List[dict]:
+        """Refresh the status of tracked jobs for this provider.
+
+        Args:
+            job_ids: Optional job IDs; defaults to every tracked job
+
+        Returns:
+            The updated job records
+        """
+        jobs = self._select(job_ids)
+        for job in jobs:
+            job["status"] = self._job_backend(job).status(job["id"])
+            self.jobs.save(job)
+        return jobs
+
+    def collect(
+        self, job_ids: Optional[Sequence[str]] = None
+    ) -> List[Tuple[str, str, Optional[str], Optional[str]]]:
+        """Download completed jobs and write their roasts to the result store.
+
+        Collected jobs are no longer tracked; jobs still running are left alone.
+
+        Args:
+            job_ids: Optional job IDs; defaults to every tracked job
+
+        Returns:
+            (file path, language, roast, error) for each collected request
+        """
+        collected = []
+        for job in self.poll(job_ids):
+            if job["status"] == PENDING:
+                continue
+            results = {}
+            if job["status"] == COMPLETED:
+                results = self._job_backend(job).results(job["id"])
+            for custom_id, entry in job["requests"].items():
+                roast, error = results.get(
+                    custom_id, (None, f"Batch job {job['status']}")
+                )
+                if roast is not None:
+                    self.store.put(entry["key"], roast)
+                collected.append((entry["file_path"], entry["language"], roast, error))
+            self.jobs.remove(job["id"])
+        return collected
+
+    def _job_backend(self, job: dict) -> BatchBackend:
+        """Get a backend for the endpoint and model a job was submitted with."""
+        key = (job["api_endpoint"], job["model"])
+        if key not in self._backends:
+            self._backends[key] = get_batch_backend(
+                job["provider"],
+                api_endpoint=job["api_endpoint"],
+                model_name=job["model"],
+            )
+        return self._backends[key]
+
+    def _select(self, job_ids: Optional[Sequence[str]]) -> List[dict]:
+        """Load the requested jobs, or every tracked job for this provider."""
+        if job_ids:
+            jobs = [self.jobs.load(job_id) for job_id in job_ids]
+            for job in jobs:
+                if job["provider"] != self.provider_name:
+                    raise ValueError(
+                        f"Batch job {job['id']} belongs to provider {job['provider']}"
+                    )
+            return jobs
+        return [
+            job for job in self.jobs.list() if job["provider"] == self.provider_name
+        ]
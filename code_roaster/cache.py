@@ -0,0 +1,85 @@
+"""Content-addressed storage for roast results."""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from code_roaster.config import Config
+from code_roaster.llm_providers import LLMProvider
+
+
+class ResultStore:
+    """Store roast results on disk, keyed by the model and prompt that made them.
+
+    Because the key covers the full prompt, a stored result is reused only
+    when the input it was generated from is unchanged.
+    """
+
+    def __init__(self, directory: Optional[Path] = None):
+        """Initialize the result store.
+
+        Args:
+            directory: Optional directory for results; defaults to results/
+                in the cache directory
+        """
+        self.directory = directory or Config.get_cache_dir() / "results"
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(llm_provider: LLMProvider, prompt: str) -> str:
+        """Compute the storage key for a prompt sent to a provider.
+
+        Args:
+            llm_provider: The provider that generates the result
+            prompt: The full prompt
+
+        Returns:
+            A hex digest identifying the result
+        """
+        digest = hashlib.sha256()
+        for part in (
+            type(llm_provider).__name__,
+            llm_provider.get_model_name,
+            repr(llm_provider.max_tokens),
+            repr(llm_provider.stop),
+            prompt,
+        ):
+            digest.update(str(part).encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.txt"
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a stored result.
+
+        Args:
+            key: The result key
+
+        Returns:
+            The stored text, or None if there is no result for the key
+        """
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def put(self, key: str, text: str) -> None:
+        """Store a result.
+
+        Args:
+            key: The result key
+            text: The result text
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(
+            f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            file.write(text)
+        tmp_path.replace(path)
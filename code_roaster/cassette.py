@@ -0,0 +1,255 @@
+"""Record and replay model streams for deterministic offline runs.
+
+In record mode every streamed response is saved, chunk by chunk with the
+time between chunks, to a compact gzipped JSON "cassette" named after the
+prompt and model. In replay mode a provider reads the cassettes back through
+the normal provider code path, at the recorded speed or as fast as possible,
+without network access or credentials.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+from langchain_core.messages import AIMessageChunk
+
+from code_roaster.config import Config
+from code_roaster.llm_providers import LLMProvider
+
+CASSETTE_VERSION = 1
+
+
+def _prompt_digest(prompt: str) -> str:
+    """Hash a prompt for use in cassette file names."""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:32]
+
+
+def _model_slug(model_name: str) -> str:
+    """Make a model name safe for use in file names."""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", model_name)
+
+
+def cassette_path(directory: Path, prompt: str, model_name: str) -> Path:
+    """Get the cassette file for a prompt sent to a model.
+
+    Args:
+        directory: The cassette directory
+        prompt: The full prompt
+        model_name: The model the prompt was sent to
+
+    Returns:
+        The cassette file path
+    """
+    return directory / f"{_prompt_digest(prompt)}.{_model_slug(model_name)}.json.gz"
+
+
+class RecordingLLM:
+    """Chat model wrapper that saves every streamed response to a cassette."""
+
+    def __init__(self, llm: Any, directory: Path, model_name: str):
+        """Initialize the recorder.
+
+        Args:
+            llm: The LangChain chat model being recorded
+            directory: Directory the cassettes are written to
+            model_name: The model name stored with each cassette
+        """
+        self.llm = llm
+        self.directory = directory
+        self.model_name = model_name
+        self.streaming = getattr(llm, "streaming", False)
+
+    def stream(self, prompt: str) -> Iterator[Any]:
+        """Stream from the wrapped model, recording the chunks and timings.
+
+        Only complete responses are saved; a stream that is abandoned part
+        way through leaves no cassette.
+        """
+        chunks: List[list] = []
+        last = time.monotonic()
+        try:
+            for chunk in self.llm.stream(prompt):
+                now = time.monotonic()
+                content = chunk.content if hasattr(chunk, "content") else str(chunk)
+                chunks.append([round(now - last, 4), content])
+                last = now
+                yield chunk
+        except Exception as e:
+            self._save(prompt, chunks, error=str(e))
+            raise
+        self._save(prompt, chunks)
+
+    async def astream(self, prompt: str) -> AsyncIterator[Any]:
+        """Stream asynchronously from the wrapped model, recording as stream() does."""
+        chunks: List[list] = []
+        last = time.monotonic()
+        try:
+            async for chunk in self.llm.astream(prompt):
+                now = time.monotonic()
+                content = chunk.content if hasattr(chunk, "content") else str(chunk)
+                chunks.append([round(now - last, 4), content])
+                last = now
+                yield chunk
+        except Exception as e:
+            self._save(prompt, chunks, error=str(e))
+            raise
+        self._save(prompt, chunks)
+
+    def invoke(self, prompt: str) -> Any:
+        """Invoke the wrapped model, recording the response as a single chunk."""
+        started = time.monotonic()
+        response = self.llm.invoke(prompt)
+        content = response.content if hasattr(response, "content") else str(response)
+        self._save(prompt, [[round(time.monotonic() - started, 4), content]])
+        return response
+
+    async def ainvoke(self, prompt: str) -> Any:
+        """Invoke the wrapped model asynchronously, recording as invoke() does."""
+        started = time.monotonic()
+        response = await self.llm.ainvoke(prompt)
+        content = response.content if hasattr(response, "content") else str(response)
+        self._save(prompt, [[round(time.monotonic() - started, 4), content]])
+        return response
+
+    def _save(
+        self, prompt: str, chunks: List[list], error: Optional[str] = None
+    ) -> None:
+        """Write a cassette."""
+        cassette = {
+            "version": CASSETTE_VERSION,
+            "model": self.model_name,
+            "chunks": chunks,
+        }
+        if error is not None:
+            cassette["error"] = error
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = cassette_path(self.directory, prompt, self.model_name)
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            json.dump(cassette, file, separators=(",", ":"))
+
+
+class ReplayLLM:
+    """Chat model stand-in that streams recorded cassettes."""
+
+    streaming = True
+
+    def __init__(self, directory: Path, model_name: str, realtime: bool = False):
+        """Initialize the replayer.
+
+        Args:
+            directory: Directory the cassettes are read from
+            model_name: The model whose cassettes are preferred
+            realtime: Whether to reproduce the recorded gaps between chunks
+        """
+        self.directory = directory
+        self.model_name = model_name
+        self.realtime = realtime
+
+    def _load(self, prompt: str) -> dict:
+        """Find and load the cassette for a prompt.
+
+        A cassette recorded for this model is preferred; otherwise any
+        cassette for the same prompt is used, so router recordings replay
+        regardless of which backend served them.
+        """
+        path = cassette_path(self.directory, prompt, self.model_name)
+        if not path.exists():
+            matches = sorted(self.directory.glob(f"{_prompt_digest(prompt)}.*.json.gz"))
+            if not matches:
+                raise ValueError(
+                    f"No cassette recorded for this prompt in {self.directory}"
+                )
+            path = matches[0]
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            return json.load(file)
+
+    def stream(self, prompt: str) -> Iterator[AIMessageChunk]:
+        """Stream the recorded chunks for a prompt."""
+        cassette = self._load(prompt)
+        for delay, content in cassette["chunks"]:
+            if self.realtime and delay > 0:
+                time.sleep(delay)
+            yield AIMessageChunk(content=content)
+        if "error" in cassette:
+            raise RuntimeError(cassette["error"])
+
+    async def astream(self, prompt: str) -> AsyncIterator[AIMessageChunk]:
+        """Stream the recorded chunks for a prompt asynchronously."""
+        cassette = self._load(prompt)
+        for delay, content in cassette["chunks"]:
+            if self.realtime and delay > 0:
+                await asyncio.sleep(delay)
+            yield AIMessageChunk(content=content)
+        if "error" in cassette:
+            raise RuntimeError(cassette["error"])
+
+    def invoke(self, prompt: str) -> AIMessageChunk:
+        """Return the whole recorded response as one message."""
+        return AIMessageChunk(
+            content="".join(chunk.content for chunk in self.stream(prompt))
+        )
+
+    async def ainvoke(self, prompt: str) -> AIMessageChunk:
+        """Return the whole recorded response as one message, asynchronously."""
+        return AIMessageChunk(
+            content="".join([chunk.content async for chunk in self.astream(prompt)])
+        )
+
+
+class ReplayProvider(LLMProvider):
+    """Provider that replays cassettes instead of calling a model.
+
+    The model name is resolved the same way as for the recorded provider, so
+    no API key or endpoint is needed.
+    """
+
+    def __init__(
+        self,
+        provider_name: str,
+        cassette_dir: str,
+        realtime: bool = False,
+        **kwargs: Any,
+    ):
+        """Initialize the replay provider.
+
+        Args:
+            provider_name: The name of the provider that was recorded
+            cassette_dir: Directory the cassettes are read from
+            realtime: Whether to reproduce the recorded gaps between chunks
+            **kwargs: Other LLMProvider arguments, such as model_name and timeout
+        """
+        self.provider_name = provider_name
+        self.cassette_dir = Path(cassette_dir)
+        self.realtime = realtime
+        super().__init__(**kwargs)
+
+    def initialize(self) -> None:
+        """Initialize the cassette reader."""
+        self.model_name = Config.get_model(self.provider_name, self.model_name)
+        if not self.cassette_dir.is_dir():
+            raise ValueError(f"Cassette directory not found: {self.cassette_dir}")
+        self.llm = ReplayLLM(self.cassette_dir, self.model_name, self.realtime)
+
+
+def start_recording(llm_provider: LLMProvider, cassette_dir: str) -> None:
+    """Record every response the provider streams from now on.
+
+    For the router, each backend is recorded under its own model name.
+
+    Args:
+        llm_provider: The provider to record
+        cassette_dir: Directory the cassettes are written to
+    """
+    backends = getattr(llm_provider, "backends", None)
+    if backends:
+        for backend in backends.values():
+            start_recording(backend, cassette_dir)
+        return
+    llm_provider.llm = RecordingLLM(
+        llm_provider.llm, Path(cassette_dir), llm_provider.get_model_name
+    )
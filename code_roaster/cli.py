@@ -1,22 +1,31 @@
 """Command-line interface for Code Roaster."""
 
+import os
 import sys
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import click
 
+from code_roaster.batch import BatchRunner
+from code_roaster.cassette import ReplayProvider, start_recording
+from code_roaster.compare import ModelComparison
 from code_roaster.config import Config, DEFAULT_PROVIDER
 from code_roaster.formatters import TerminalFormatter
-from code_roaster.llm_providers import get_provider
+from code_roaster.llm_providers import RoastFailed, RoastTimeout, get_provider
+from code_roaster.packing import PackedRoaster
 from code_roaster.roaster import CodeRoaster
+from code_roaster.summary import RepoSummarizer
+from code_roaster.watcher import RoastWatcher
 
 
 @click.command()
-@click.argument("file_path", type=click.Path(exists=True), required=False)
+@click.argument("file_paths", nargs=-1, type=click.Path(exists=True))
 @click.option(
     "--provider",
     "-p",
-    type=click.Choice(["openai", "anthropic", "ollama", "openrouter"], case_sensitive=False),
+    type=click.Choice(
+        ["openai", "anthropic", "ollama", "openrouter", "router"], case_sensitive=False
+    ),
     default=DEFAULT_PROVIDER,
     help="LLM provider to use for roasting",
 )
@@ -36,17 +45,152 @@ from code_roaster.roaster import CodeRoaster
     is_flag=True,
     help="List available LLM providers",
 )
+@click.option(
+    "--watch",
+    "-w",
+    is_flag=True,
+    help="Watch the given files or directories and re-roast them on save",
+)
+@click.option(
+    "--debounce",
+    type=click.FloatRange(min=0),
+    default=0.5,
+    show_default=True,
+    help="Seconds a file must be quiet before it is re-roasted in watch mode",
+)
+@click.option(
+    "--timeout",
+    "-t",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Deadline in seconds for each roast; slower roasts return what they have",
+)
+@click.option(
+    "--max-tokens",
+    type=click.IntRange(min=1),
+    help="Maximum number of output tokens per roast",
+)
+@click.option(
+    "--stop",
+    "stop_sequences",
+    multiple=True,
+    help="Stop sequence that ends generation early (can be repeated)",
+)
+@click.option(
+    "--summary",
+    "-s",
+    is_flag=True,
+    help="Roast the whole repository by combining per-file roasts",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Maximum number of roasts to run at once",
+)
+@click.option(
+    "--hotspots",
+    is_flag=True,
+    help="For long files, send only the most complex and duplicated regions",
+)
+@click.option(
+    "--hotspot-lines",
+    type=click.IntRange(min=10),
+    default=120,
+    show_default=True,
+    help="Maximum number of code lines sent per file with --hotspots",
+)
+@click.option(
+    "--batch",
+    type=click.Choice(["submit", "poll", "collect"], case_sensitive=False),
+    help="Roast offline through the provider's batch API: submit a job, poll it, collect results",
+)
+@click.option(
+    "--job-id",
+    "job_ids",
+    multiple=True,
+    help="Batch job to poll or collect (can be repeated; defaults to all tracked jobs)",
+)
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False),
+    help="Write collected batch roasts as Markdown files into this directory",
+)
+@click.option(
+    "--record",
+    "record_dir",
+    type=click.Path(file_okay=False),
+    help="Record every model response, with chunk timings, into cassettes in this directory",
+)
+@click.option(
+    "--replay",
+    "replay_dir",
+    type=click.Path(exists=True, file_okay=False),
+    help="Replay recorded cassettes from this directory instead of calling the model",
+)
+@click.option(
+    "--replay-speed",
+    type=click.Choice(["fast", "recorded"], case_sensitive=False),
+    default="fast",
+    show_default=True,
+    help="Replay as fast as possible or with the recorded gaps between chunks",
+)
+@click.option(
+    "--pack",
+    is_flag=True,
+    help="Roast small files together in shared requests when roasting several files",
+)
+@click.option(
+    "--pack-tokens",
+    type=click.IntRange(min=100),
+    default=4000,
+    show_default=True,
+    help="Approximate token budget of code per packed request",
+)
+@click.option(
+    "--compare",
+    "compare_targets",
+    multiple=True,
+    help="Roast one file concurrently on several provider[:model] pairs (can be repeated or comma-separated)",
+)
+@click.option(
+    "--scorecard-json",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the --compare latency scorecard to this JSON file",
+)
 @click.version_option()
 def main(
-    file_path: str,
+    file_paths: Tuple[str, ...],
     provider: str,
     api_endpoint: Optional[str],
     model: Optional[str],
     list_providers: bool,
+    watch: bool,
+    debounce: float,
+    timeout: Optional[float],
+    max_tokens: Optional[int],
+    stop_sequences: Tuple[str, ...],
+    summary: bool,
+    jobs: int,
+    hotspots: bool,
+    hotspot_lines: int,
+    batch: Optional[str],
+    job_ids: Tuple[str, ...],
+    output_dir: Optional[str],
+    record_dir: Optional[str],
+    replay_dir: Optional[str],
+    replay_speed: str,
+    pack: bool,
+    pack_tokens: int,
+    compare_targets: Tuple[str, ...],
+    scorecard_json: Optional[str],
 ) -> None:
-    """Roast a code file using AI.
+    """Roast code files using AI.
 
-    FILE_PATH is the path to the code file to roast.
+    FILE_PATHS are the code files to roast. Directories are searched
+    recursively for supported files.
     """
     formatter = TerminalFormatter()
 
@@ -57,35 +201,128 @@ def main(
         return
 
     # Ensure file_path is provided if not listing providers
-    if not file_path:
+    if not file_paths and batch not in ("poll", "collect"):
         formatter.display_error("File path is required when not using --list-providers")
         sys.exit(1)
 
+    if record_dir and replay_dir:
+        formatter.display_error("--record and --replay cannot be used together")
+        sys.exit(1)
+
+    modes = [
+        option
+        for option, enabled in (
+            ("--watch", watch),
+            ("--summary", summary),
+            ("--batch", batch),
+            ("--pack", pack),
+            ("--compare", compare_targets),
+        )
+        if enabled
+    ]
+    if len(modes) > 1:
+        formatter.display_error(f"{', '.join(modes)} cannot be used together")
+        sys.exit(1)
+
+    if compare_targets and (record_dir or replay_dir):
+        formatter.display_error("--compare cannot be used with --record or --replay")
+        sys.exit(1)
+
+    if batch and (record_dir or replay_dir):
+        formatter.display_error("--batch cannot be used with --record or --replay")
+        sys.exit(1)
+
+    if provider == "router" and api_endpoint:
+        formatter.display_error(
+            "--api-endpoint cannot be used with the router; "
+            "set <PROVIDER>_API_ENDPOINT for each backend instead"
+        )
+        sys.exit(1)
+
     try:
+        if compare_targets:
+            _compare_models(
+                formatter,
+                file_paths,
+                compare_targets,
+                timeout=timeout,
+                max_tokens=max_tokens,
+                stop=list(stop_sequences),
+                hotspot_lines=hotspot_lines if hotspots else None,
+                scorecard_json=scorecard_json,
+            )
+            return
+
         # Get the LLM provider
-        llm_provider = get_provider(
-            provider_name=provider,
-            api_endpoint=api_endpoint,
-            model_name=model,
-        )
+        if replay_dir:
+            llm_provider = ReplayProvider(
+                provider_name=provider,
+                cassette_dir=replay_dir,
+                realtime=replay_speed == "recorded",
+                model_name=model,
+                timeout=timeout,
+                max_tokens=max_tokens,
+                stop=list(stop_sequences),
+            )
+        else:
+            llm_provider = get_provider(
+                provider_name=provider,
+                api_endpoint=api_endpoint,
+                model_name=model,
+                timeout=timeout,
+                max_tokens=max_tokens,
+                stop=list(stop_sequences),
+            )
+        if record_dir:
+            start_recording(llm_provider, record_dir)
 
         # Create the code roaster
-        roaster = CodeRoaster(llm_provider)
+        roaster = CodeRoaster(
+            llm_provider, hotspot_lines=hotspot_lines if hotspots else None
+        )
 
-        # Display info message
-        formatter.display_info(f"Roasting {file_path} using {provider} with model {llm_provider.get_model_name}...")
+        if watch:
+            RoastWatcher(roaster, formatter, list(file_paths), debounce=debounce).run()
+            return
 
-        # Roast the code
-        code_content, roast_content, language = roaster.roast_code(file_path)
+        if summary:
+            _roast_repository(roaster, formatter, file_paths, jobs)
+            return
 
-        # Format and display the results
-        formatter.format_roast(
-            code_content=code_content,
-            roast_content=roast_content,
-            language=language,
-            file_path=file_path,
-        )
+        if batch:
+            runner = BatchRunner(roaster, provider, api_endpoint=api_endpoint)
+            _run_batch(runner, formatter, batch, file_paths, job_ids, output_dir)
+            return
+
+        code_files = CodeRoaster.find_code_files(file_paths)
+        if pack and len(code_files) > 1:
+            _roast_packed(roaster, formatter, code_files, pack_tokens, jobs)
+            return
+
+        for file_path in code_files:
+            # Display info message
+            formatter.display_info(f"Roasting {file_path} using {provider} with model {llm_provider.get_model_name}...")
 
+            # Roast the code
+            code_content, roast_content, language = roaster.roast_code(file_path)
+            if isinstance(roast_content, RoastFailed):
+                formatter.display_error(f"Roast of {file_path} failed: {roast_content}")
+                continue
+            if isinstance(roast_content, RoastTimeout):
+                formatter.display_warning(
+                    f"Roast timed out after {roast_content.timeout:g}s, showing partial output"
+                )
+
+            # Format and display the results
+            formatter.format_roast(
+                code_content=code_content,
+                roast_content=roast_content,
+                language=language,
+                file_path=file_path,
+            )
+
+    except KeyboardInterrupt:
+        formatter.display_info("Stopped")
     except FileNotFoundError as e:
         formatter.display_error(str(e))
         sys.exit(1)
@@ -97,5 +334,191 @@ def main(
         sys.exit(1)
 
 
+def _roast_repository(
+    roaster: CodeRoaster,
+    formatter: TerminalFormatter,
+    file_paths: Tuple[str, ...],
+    jobs: int,
+) -> None:
+    """Build and display a hierarchical roast of a whole repository.
+
+    Args:
+        roaster: The code roaster to use
+        formatter: The formatter used for output
+        file_paths: Files and directories making up the repository
+        jobs: Maximum number of roasts to run at once
+    """
+
+    def progress(path: str, reused: bool) -> None:
+        action = "Reused" if reused else "Roasted"
+        formatter.display_info(f"{action} {path}")
+
+    summarizer = RepoSummarizer(roaster, max_workers=jobs, progress=progress)
+    result = summarizer.summarize(file_paths)
+    counts = (
+        f"{result.computed} roasts generated, {result.reused} reused, "
+        f"{result.failed} failed"
+    )
+    if not result.succeeded:
+        formatter.display_error(
+            f"Could not roast repository {result.root} ({counts})"
+        )
+        return
+    formatter.format_summary(result.root, result.roast)
+    formatter.display_success(counts)
+
+
+def _compare_models(
+    formatter: TerminalFormatter,
+    file_paths: Tuple[str, ...],
+    targets: Tuple[str, ...],
+    timeout: Optional[float],
+    max_tokens: Optional[int],
+    stop: List[str],
+    hotspot_lines: Optional[int],
+    scorecard_json: Optional[str],
+) -> None:
+    """Roast one file on several models at once and display a scorecard.
+
+    Args:
+        formatter: The formatter used for output
+        file_paths: The file to roast, which must be exactly one
+        targets: provider[:model] pairs to compare
+        timeout: Optional deadline in seconds for each roast
+        max_tokens: Optional cap on the number of output tokens
+        stop: Stop sequences that end generation early
+        hotspot_lines: Optional hotspot line budget
+        scorecard_json: Optional file the scorecard is written to
+
+    Raises:
+        ValueError: If the paths do not name exactly one code file
+    """
+    code_files = CodeRoaster.find_code_files(file_paths)
+    if len(code_files) != 1:
+        raise ValueError(f"--compare needs exactly one code file, got {len(code_files)}")
+    file_path = code_files[0]
+
+    comparison = ModelComparison(
+        targets,
+        timeout=timeout,
+        max_tokens=max_tokens,
+        stop=stop,
+        hotspot_lines=hotspot_lines,
+    )
+    formatter.display_info(f"Roasting {file_path} on {len(comparison.runs)} models...")
+    with formatter.live_comparison(comparison.snapshot):
+        comparison.run(file_path)
+
+    formatter.format_comparison(file_path, comparison.snapshot())
+    formatter.display_scorecard(comparison.scorecard())
+    if scorecard_json:
+        comparison.export_scorecard(scorecard_json)
+        formatter.display_success(f"Wrote scorecard to {scorecard_json}")
+
+
+def _roast_packed(
+    roaster: CodeRoaster,
+    formatter: TerminalFormatter,
+    code_files: List[str],
+    pack_tokens: int,
+    jobs: int,
+) -> None:
+    """Roast many files, packing small ones into shared requests.
+
+    Args:
+        roaster: The code roaster to use
+        formatter: The formatter used for output
+        code_files: The code files to roast
+        pack_tokens: Approximate token budget of code per packed request
+        jobs: Maximum number of requests to run at once
+    """
+
+    def show(file_path: str, code_content: str, roast_content: str, language: str) -> None:
+        if isinstance(roast_content, RoastFailed):
+            formatter.display_error(f"Roast of {file_path} failed: {roast_content}")
+            return
+        if isinstance(roast_content, RoastTimeout):
+            formatter.display_warning(f"Roast of {file_path} timed out")
+        formatter.format_roast(
+            code_content=code_content,
+            roast_content=roast_content,
+            language=language,
+            file_path=file_path,
+        )
+
+    if roaster.llm_provider.max_tokens is not None:
+        formatter.display_warning(
+            "--max-tokens caps each response, so files are roasted one per request"
+        )
+    packer = PackedRoaster(roaster, token_budget=pack_tokens, max_workers=jobs)
+    formatter.display_info(f"Roasting {len(code_files)} files with packed requests...")
+    packer.roast_files(code_files, show)
+    formatter.display_success(f"Roasted {len(code_files)} files in {packer.requests} requests")
+
+
+def _run_batch(
+    runner: BatchRunner,
+    formatter: TerminalFormatter,
+    action: str,
+    file_paths: Tuple[str, ...],
+    job_ids: Tuple[str, ...],
+    output_dir: Optional[str],
+) -> None:
+    """Submit, poll or collect batch roasting jobs.
+
+    Args:
+        runner: The batch runner to use
+        formatter: The formatter used for output
+        action: "submit", "poll" or "collect"
+        file_paths: Files and directories to roast when submitting
+        job_ids: Jobs to poll or collect; all tracked jobs if empty
+        output_dir: Optional directory for collected roasts
+    """
+    if action == "submit":
+        submitted, stored, in_flight = runner.submit(file_paths)
+        for job in submitted:
+            formatter.display_success(
+                f"Submitted batch job {job['id']} with {len(job['requests'])} roasts"
+            )
+        if stored:
+            formatter.display_info(f"Skipped {stored} files with stored roasts")
+        if in_flight:
+            formatter.display_info(
+                f"Skipped {in_flight} files already waiting in pending batch jobs"
+            )
+        if not submitted:
+            formatter.display_info("Nothing to submit")
+        return
+
+    if action == "poll":
+        formatter.display_batch_jobs(runner.poll(job_ids))
+        return
+
+    collected = runner.collect(job_ids)
+    if not collected:
+        formatter.display_info("No completed batch jobs to collect")
+    for file_path, language, roast_content, error in collected:
+        if error:
+            formatter.display_error(f"{file_path}: {error}")
+        elif output_dir:
+            relative = os.path.relpath(file_path)
+            if relative.startswith(os.pardir):
+                relative = file_path.lstrip(os.sep)
+            out_path = os.path.join(output_dir, f"{relative}.md")
+            os.makedirs(os.path.dirname(out_path), exist_ok=True)
+            with open(out_path, "w", encoding="utf-8") as file:
+                file.write(f"# Roast of {relative}\n\n{roast_content}\n")
+            formatter.display_success(f"Wrote {out_path}")
+        elif not os.path.exists(file_path):
+            formatter.display_warning(f"{file_path} no longer exists; its roast is in the result store")
+        else:
+            formatter.format_roast(
+                code_content=CodeRoaster.read_code_file(file_path),
+                roast_content=roast_content,
+                language=language,
+                file_path=file_path,
+            )
+
+
 if __name__ == "__main__":
     main()  # pragma: no cover
\ No newline at end of file
@@ -0,0 +1,203 @@
+"""Roast one file on several models at once and score their latency."""
+
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from code_roaster.llm_providers import LLMProvider, RoastDeadlineExceeded, get_provider
+from code_roaster.packing import estimate_tokens
+from code_roaster.roaster import CodeRoaster
+from code_roaster.router import parse_backends
+
+
+class ModelRun:
+    """The streamed roast and timings of one model in a comparison."""
+
+    def __init__(self, provider_name: str, model_name: Optional[str]):
+        """Initialize the run.
+
+        Args:
+            provider_name: The name of the LLM provider
+            model_name: The model name, or None for the provider's default
+        """
+        self.provider_name = provider_name
+        self.model_name = model_name
+        self.llm_provider: Optional[LLMProvider] = None
+        self.chunks: List[str] = []
+        self.started: Optional[float] = None
+        self.first_token: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        """The provider:model label for display."""
+        return f"{self.provider_name}:{self.model_name or 'default'}"
+
+    @property
+    def text(self) -> str:
+        """The roast streamed so far."""
+        return "".join(self.chunks)
+
+    @property
+    def status(self) -> str:
+        """A short description of the run's progress."""
+        if self.error:
+            return "error"
+        if self.finished is not None:
+            return "done"
+        if self.first_token is not None:
+            return "streaming"
+        return "waiting"
+
+    def score(self) -> Dict[str, Any]:
+        """Build this model's scorecard entry.
+
+        Output tokens are estimated from the text length. Tokens per second
+        is measured over the streaming time after the first token, or over
+        the total time when the whole roast arrived in one chunk.
+
+        Returns:
+            A JSON-serializable dictionary of metrics
+        """
+        ttft = None
+        total = None
+        if self.started is not None and self.first_token is not None:
+            ttft = self.first_token - self.started
+        if self.started is not None and self.finished is not None:
+            total = self.finished - self.started
+        tokens = estimate_tokens(self.text) if self.chunks else 0
+        tokens_per_sec = None
+        if ttft is not None and total is not None:
+            streaming = total - ttft if len(self.chunks) > 1 else total
+            if streaming > 0:
+                tokens_per_sec = tokens / streaming
+        return {
+            "provider": self.provider_name,
+            "model": self.model_name,
+            "time_to_first_token": ttft,
+            "total_time": total,
+            "output_tokens": tokens,
+            "tokens_per_sec": tokens_per_sec,
+            "error": self.error,
+        }
+
+
+class ModelComparison:
+    """Roast the same file concurrently on a list of provider/model pairs."""
+
+    def __init__(
+        self,
+        targets: Sequence[str],
+        timeout: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        stop: Optional[List[str]] = None,
+        hotspot_lines: Optional[int] = None,
+    ):
+        """Initialize the comparison.
+
+        Args:
+            targets: provider[:model] entries; each may be a comma-separated list
+            timeout: Optional deadline in seconds for each roast
+            max_tokens: Optional cap on the number of output tokens
+            stop: Optional stop sequences that end generation early
+            hotspot_lines: Optional hotspot line budget, as for CodeRoaster
+        """
+        self.runs: List[ModelRun] = [
+            ModelRun(provider_name, model_name)
+            for provider_name, model_name in parse_backends(",".join(targets))
+        ]
+        self.timeout = timeout
+        self.max_tokens = max_tokens
+        self.stop = stop
+        self.hotspot_lines = hotspot_lines
+        self.file_path: Optional[str] = None
+        self.code_content = ""
+        self.language = ""
+
+    def run(self, file_path: str) -> None:
+        """Roast a file on every model concurrently and wait for all of them.
+
+        Errors are recorded per model rather than raised.
+
+        Args:
+            file_path: Path to the code file to roast
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file type is not supported
+        """
+        self.file_path = file_path
+        self.code_content = CodeRoaster.read_code_file(file_path)
+        self.language = CodeRoaster.detect_language(file_path)
+
+        threads = [
+            threading.Thread(target=self._run_model, args=(run,), daemon=True)
+            for run in self.runs
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _run_model(self, run: ModelRun) -> None:
+        """Stream one model's roast, recording its timings."""
+        try:
+            run.llm_provider = get_provider(
+                provider_name=run.provider_name,
+                model_name=run.model_name,
+                timeout=self.timeout,
+                max_tokens=self.max_tokens,
+                stop=self.stop,
+            )
+            run.model_name = run.llm_provider.get_model_name
+            roaster = CodeRoaster(run.llm_provider, hotspot_lines=self.hotspot_lines)
+            prompt = roaster.build_prompt(self.code_content, self.language)
+
+            run.started = time.monotonic()
+            for text in run.llm_provider.stream_prompt(prompt):
+                if run.first_token is None:
+                    run.first_token = time.monotonic()
+                run.chunks.append(text)
+        except RoastDeadlineExceeded:
+            run.error = f"timed out after {self.timeout:g}s"
+        except Exception as e:
+            run.error = str(e)
+        finally:
+            run.finished = time.monotonic()
+
+    def snapshot(self) -> List[Tuple[str, str, str]]:
+        """Get the current state of every run for display.
+
+        Returns:
+            (label, roast so far, status) for each model
+        """
+        return [
+            (run.label, run.text or run.error or "", run.status) for run in self.runs
+        ]
+
+    def scorecard(self) -> List[Dict[str, Any]]:
+        """Get the scorecard entry of every model.
+
+        Returns:
+            One metrics dictionary per model, in target order
+        """
+        return [run.score() for run in self.runs]
+
+    def export_scorecard(self, path: str) -> None:
+        """Write the scorecard to a JSON file.
+
+        Args:
+            path: The file to write
+        """
+        report = {
+            "file": self.file_path,
+            "language": self.language,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "timeout": self.timeout,
+            "max_tokens": self.max_tokens,
+            "results": self.scorecard(),
+        }
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
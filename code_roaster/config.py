@@ -1,6 +1,7 @@
 """Configuration handling for Code Roaster."""
 
 import os
+from pathlib import Path
 from typing import Dict, Optional
 
 from dotenv import load_dotenv
@@ -22,6 +23,8 @@ DEFAULT_MODELS = {
     "anthropic": "claude-3-5-haiku-latest",
     "ollama": "llama3",
     "openrouter": "openai/gpt-4o-mini",
+    # The router's "model" is the list of provider[:model] backends it routes between
+    "router": "openai,anthropic,openrouter,ollama",
 }
 
 # Default provider
@@ -100,6 +103,26 @@ class Config:
 
         return model
 
+    @staticmethod
+    def get_cache_dir() -> Path:
+        """Get the directory where Code Roaster keeps local state.
+
+        Uses CODE_ROASTER_CACHE_DIR if set, otherwise a code-roaster directory
+        under XDG_CACHE_HOME (or ~/.cache). The directory is created if needed.
+
+        Returns:
+            The cache directory path
+        """
+        cache_dir = os.getenv("CODE_ROASTER_CACHE_DIR")
+        if cache_dir:
+            path = Path(cache_dir)
+        else:
+            base = os.getenv("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+            path = Path(base) / "code-roaster"
+
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
     @staticmethod
     def get_available_providers() -> Dict[str, bool]:
         """Get a dictionary of available providers and their availability status.
@@ -1,10 +1,12 @@
 """Terminal output formatting for Code Roaster."""
 
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
-from rich.console import Console
+from rich.console import Console, RenderableType
+from rich.live import Live
 from rich.panel import Panel
 from rich.syntax import Syntax
+from rich.table import Table
 from rich.text import Text
 
 
@@ -52,6 +54,29 @@ class TerminalFormatter:
         self.console.print(roast_panel)
         self.console.print()
 
+    def format_summary(self, root: str, roast_content: str) -> None:
+        """Format and display a repository-level roast.
+
+        Args:
+            root: The repository root directory
+            roast_content: The repository roast from the LLM
+        """
+        self.console.print()
+        self.console.print(
+            f"[bold cyan]Code Roaster[/bold cyan] - Roasting repository [bold yellow]{root}[/bold yellow]"
+        )
+        self.console.print()
+
+        self.console.print("[bold red]🔥 The Repository Roast 🔥[/bold red]")
+        roast_panel = Panel(
+            Text(roast_content, style="bold"),
+            border_style="red",
+            title="Code Roaster",
+            title_align="center",
+        )
+        self.console.print(roast_panel)
+        self.console.print()
+
     def display_error(self, message: str) -> None:
         """Display an error message.
 
@@ -94,4 +119,115 @@ class TerminalFormatter:
         for provider, available in providers.items():
             status = "[green]✓[/green]" if available else "[red]✗[/red]"
             self.console.print(f"  {status} {provider.capitalize()}")
-        self.console.print()
\ No newline at end of file
+        self.console.print()
+
+    def display_batch_jobs(self, jobs: List[Dict]) -> None:
+        """Display the status of tracked batch jobs.
+
+        Args:
+            jobs: Batch job records with id, provider, model, status and requests
+        """
+        if not jobs:
+            self.console.print("[bold cyan]No batch jobs are being tracked.[/bold cyan]")
+            return
+
+        styles = {"pending": "yellow", "completed": "green", "failed": "red"}
+        self.console.print("[bold cyan]Batch Jobs:[/bold cyan]")
+        for job in jobs:
+            style = styles.get(job["status"], "white")
+            self.console.print(
+                f"  [{style}]{job['status']:<9}[/{style}] {job['id']} "
+                f"({job['provider']}, {job['model']}, {len(job['requests'])} roasts)"
+            )
+        self.console.print()
+
+    def comparison_panels(self, runs: Sequence[Tuple[str, str, str]]) -> RenderableType:
+        """Render the roasts of several models side by side.
+
+        Args:
+            runs: (model label, roast so far, status) for each model
+
+        Returns:
+            A grid with one panel per model
+        """
+        styles = {"waiting": "yellow", "streaming": "cyan", "done": "green", "error": "red"}
+        grid = Table.grid(expand=True, padding=(0, 1))
+        panels = []
+        for label, roast_content, status in runs:
+            grid.add_column(ratio=1)
+            style = styles.get(status, "white")
+            panels.append(
+                Panel(
+                    Text(roast_content, style="bold"),
+                    border_style=style,
+                    title=label,
+                    subtitle=f"[{style}]{status}[/{style}]",
+                )
+            )
+        grid.add_row(*panels)
+        return grid
+
+    def live_comparison(self, snapshot: Callable[[], Sequence[Tuple[str, str, str]]]) -> Live:
+        """Create a live display of roasts streaming in from several models.
+
+        Args:
+            snapshot: Callable returning (model label, roast so far, status)
+                for each model whenever the display refreshes
+
+        Returns:
+            A Rich Live display to use as a context manager
+        """
+        return Live(
+            get_renderable=lambda: self.comparison_panels(snapshot()),
+            console=self.console,
+            transient=True,
+            refresh_per_second=8,
+        )
+
+    def format_comparison(
+        self, file_path: str, runs: Sequence[Tuple[str, str, str]]
+    ) -> None:
+        """Format and display the final roasts of a model comparison.
+
+        Args:
+            file_path: The path to the roasted file
+            runs: (model label, roast, status) for each model
+        """
+        self.console.print()
+        self.console.print(
+            f"[bold cyan]Code Roaster[/bold cyan] - Comparing roasts of [bold yellow]{file_path}[/bold yellow]"
+        )
+        self.console.print()
+        self.console.print(self.comparison_panels(runs))
+        self.console.print()
+
+    def display_scorecard(self, scores: List[Dict[str, Any]]) -> None:
+        """Display the latency scorecard of a model comparison.
+
+        Args:
+            scores: Scorecard entries with provider, model, time_to_first_token,
+                total_time, output_tokens, tokens_per_sec and error
+        """
+
+        def seconds(value: Optional[float]) -> str:
+            return "-" if value is None else f"{value:.2f}s"
+
+        table = Table(title="Scorecard", title_style="bold cyan")
+        table.add_column("Model", style="bold")
+        table.add_column("TTFT", justify="right")
+        table.add_column("Total", justify="right")
+        table.add_column("Tokens", justify="right")
+        table.add_column("Tokens/s", justify="right")
+        table.add_column("Error", style="red")
+        for score in scores:
+            rate = score["tokens_per_sec"]
+            table.add_row(
+                f"{score['provider']}:{score['model'] or 'default'}",
+                seconds(score["time_to_first_token"]),
+                seconds(score["total_time"]),
+                str(score["output_tokens"]),
+                "-" if rate is None else f"{rate:.1f}",
+                score["error"] or "",
+            )
+        self.console.print(table)
+        self.console.print()
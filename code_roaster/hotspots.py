@@ -0,0 +1,407 @@
+"""Local static analysis that picks the most roastable parts of a file.
+
+Functions and blocks are scored by length, nesting depth, cyclomatic
+complexity and duplication. Python is analyzed with ``ast``; every other
+language uses a brace- or indentation-based heuristic.
+"""
+
+import ast
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+# Weights used to combine the metrics into a single score
+LENGTH_WEIGHT = 0.1
+NESTING_WEIGHT = 2.0
+COMPLEXITY_WEIGHT = 1.0
+DUPLICATION_WEIGHT = 10.0
+
+# Regions shorter than this are not worth sending on their own
+MIN_REGION_LINES = 3
+
+# Number of consecutive significant lines compared when looking for duplication
+DUPLICATION_WINDOW = 3
+
+_PY_FUNCTIONS = (ast.FunctionDef, ast.AsyncFunctionDef)
+_PY_BLOCKS = (
+    ast.If,
+    ast.For,
+    ast.AsyncFor,
+    ast.While,
+    ast.Try,
+    ast.With,
+    ast.AsyncWith,
+) + tuple(getattr(ast, name) for name in ("TryStar", "Match") if hasattr(ast, name))
+_PY_BRANCHES = (
+    ast.If,
+    ast.For,
+    ast.AsyncFor,
+    ast.While,
+    ast.IfExp,
+    ast.ExceptHandler,
+    ast.Assert,
+) + tuple(getattr(ast, name) for name in ("match_case",) if hasattr(ast, name))
+
+_BRANCH_PATTERN = re.compile(
+    r"\b(?:if|elif|elsif|for|foreach|while|until|unless|case|when|catch|except)\b"
+    r"|&&|\|\||\?(?![.?:])"
+)
+_STRING_PATTERN = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'')
+_LINE_COMMENT_PATTERN = re.compile(r"(?://|(?:^|\s)#).*$")
+_CONTAINER_PATTERN = re.compile(
+    r"\b(?:class|interface|struct|impl|trait|namespace|module|object|enum|extension)\b"
+)
+
+
+class Region:
+    """A scored function or block of code."""
+
+    def __init__(
+        self,
+        name: str,
+        start_line: int,
+        end_line: int,
+        nesting: int,
+        complexity: int,
+        duplication: float = 0.0,
+    ):
+        """Initialize the region.
+
+        Args:
+            name: A short label for the region, such as the function name
+            start_line: First line of the region (1-based, inclusive)
+            end_line: Last line of the region (1-based, inclusive)
+            nesting: Maximum block nesting depth inside the region
+            complexity: Cyclomatic complexity of the region
+            duplication: Fraction of the region repeated elsewhere in the file
+        """
+        self.name = name
+        self.start_line = start_line
+        self.end_line = end_line
+        self.nesting = nesting
+        self.complexity = complexity
+        self.duplication = duplication
+
+    @property
+    def length(self) -> int:
+        """Number of lines in the region."""
+        return self.end_line - self.start_line + 1
+
+    @property
+    def score(self) -> float:
+        """Combined roastability score; higher is funnier."""
+        return (
+            LENGTH_WEIGHT * self.length
+            + NESTING_WEIGHT * self.nesting
+            + COMPLEXITY_WEIGHT * self.complexity
+            + DUPLICATION_WEIGHT * self.duplication
+        )
+
+    def describe(self) -> str:
+        """Summarize the region's location and metrics in one line."""
+        return (
+            f"Lines {self.start_line}-{self.end_line}: {self.name} "
+            f"(length {self.length}, nesting {self.nesting}, "
+            f"complexity {self.complexity}, {self.duplication:.0%} duplicated)"
+        )
+
+
+def analyze(code_content: str, language: str) -> List[Region]:
+    """Find and score the functions and blocks in a file.
+
+    Args:
+        code_content: The code to analyze
+        language: The programming language of the code
+
+    Returns:
+        Regions with their metrics, in file order
+    """
+    lines = code_content.splitlines()
+    regions = None
+    if language == "python":
+        regions = _python_regions(code_content)
+    if not regions:
+        regions = _heuristic_regions(lines)
+
+    regions = [region for region in regions if region.length >= MIN_REGION_LINES]
+    _measure_duplication(lines, regions)
+    return sorted(regions, key=lambda region: region.start_line)
+
+
+def select_hotspots(
+    code_content: str, language: str, max_lines: int = 120
+) -> List[Region]:
+    """Pick the highest-scoring regions that fit in a line budget.
+
+    Args:
+        code_content: The code to analyze
+        language: The programming language of the code
+        max_lines: Maximum total number of lines across the selected regions
+
+    Returns:
+        The selected regions, in file order
+    """
+    selected: List[Region] = []
+    remaining = max_lines
+    for region in sorted(analyze(code_content, language), key=lambda r: -r.score):
+        if region.length <= remaining:
+            selected.append(region)
+            remaining -= region.length
+        elif not selected:
+            # The top region alone is over budget; send its beginning
+            region.end_line = region.start_line + remaining - 1
+            selected.append(region)
+            remaining = 0
+        if remaining < MIN_REGION_LINES:
+            break
+    return sorted(selected, key=lambda region: region.start_line)
+
+
+def build_hotspot_excerpt(
+    code_content: str, language: str, max_lines: int = 120
+) -> Optional[str]:
+    """Build a line-numbered excerpt of a file's hotspots for the prompt.
+
+    Args:
+        code_content: The code to excerpt
+        language: The programming language of the code
+        max_lines: Maximum number of code lines in the excerpt
+
+    Returns:
+        The excerpt, or None if the file already fits in the budget or no
+        regions were found
+    """
+    lines = code_content.splitlines()
+    if len(lines) <= max_lines:
+        return None
+
+    regions = select_hotspots(code_content, language, max_lines)
+    if not regions:
+        return None
+
+    width = len(str(len(lines)))
+    parts = []
+    for region in regions:
+        body = "\n".join(
+            f"{number:>{width}} | {lines[number - 1]}"
+            for number in range(region.start_line, region.end_line + 1)
+        )
+        parts.append(f"# {region.describe()}\n{body}")
+    return "\n\n".join(parts)
+
+
+def _python_regions(code_content: str) -> Optional[List[Region]]:
+    """Score top-level functions, methods and blocks using the Python AST.
+
+    Nested functions are counted as part of the function that contains them.
+    Module-level compound statements such as ``if __name__ == "__main__":``
+    are regions of their own unless they define functions or classes, which
+    are then scored individually instead. Returns None if the code does not
+    parse.
+    """
+    try:
+        tree = ast.parse(code_content)
+    except (SyntaxError, ValueError):
+        return None
+
+    lines = code_content.splitlines()
+    regions = []
+
+    def visit(node: ast.AST, prefix: str) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, _PY_FUNCTIONS):
+                start = min(
+                    [child.lineno]
+                    + [decorator.lineno for decorator in child.decorator_list]
+                )
+                regions.append(
+                    Region(
+                        name=f"function `{prefix}{child.name}`",
+                        start_line=start,
+                        end_line=child.end_lineno,
+                        nesting=_python_nesting(child),
+                        complexity=_python_complexity(child),
+                    )
+                )
+            elif isinstance(child, ast.ClassDef):
+                visit(child, f"{prefix}{child.name}.")
+            elif (
+                isinstance(node, ast.Module)
+                and isinstance(child, _PY_BLOCKS)
+                and not any(
+                    isinstance(descendant, _PY_FUNCTIONS + (ast.ClassDef,))
+                    for descendant in ast.walk(child)
+                )
+            ):
+                regions.append(
+                    Region(
+                        name=f"block {_label(lines[child.lineno - 1])}",
+                        start_line=child.lineno,
+                        end_line=child.end_lineno,
+                        nesting=_python_nesting(child),
+                        complexity=_python_complexity(child),
+                    )
+                )
+            else:
+                visit(child, prefix)
+
+    visit(tree, "")
+    return regions
+
+
+def _python_nesting(node: ast.AST, depth: int = 0) -> int:
+    """Compute the maximum block nesting depth below a node."""
+    deepest = depth
+    for child in ast.iter_child_nodes(node):
+        if isinstance(child, _PY_FUNCTIONS + (ast.ClassDef, ast.Lambda)):
+            child_depth = depth + 1
+        elif isinstance(child, _PY_BLOCKS):
+            # An elif is written at the same depth as its if
+            is_elif = (
+                isinstance(node, ast.If)
+                and isinstance(child, ast.If)
+                and node.orelse == [child]
+            )
+            child_depth = depth if is_elif else depth + 1
+        else:
+            child_depth = depth
+        deepest = max(deepest, _python_nesting(child, child_depth))
+    return deepest
+
+
+def _python_complexity(node: ast.AST) -> int:
+    """Compute the cyclomatic complexity of a function or block."""
+    complexity = 1
+    for child in ast.walk(node):
+        if isinstance(child, _PY_BRANCHES):
+            complexity += 1
+        elif isinstance(child, ast.BoolOp):
+            complexity += len(child.values) - 1
+        elif isinstance(child, ast.comprehension):
+            complexity += 1 + len(child.ifs)
+    return complexity
+
+
+def _label(line: str) -> str:
+    """Quote the first line of a region for use as its name."""
+    name = line.strip()
+    if len(name) > 60:
+        name = name[:57] + "..."
+    return f"`{name}`"
+
+
+def _strip_line(line: str) -> str:
+    """Remove string literals and line comments before counting tokens."""
+    return _LINE_COMMENT_PATTERN.sub("", _STRING_PATTERN.sub('""', line))
+
+
+def _heuristic_regions(lines: List[str]) -> List[Region]:
+    """Find blocks in any language, by braces if present, else by indentation."""
+    stripped = [_strip_line(line) for line in lines]
+    if any("{" in line for line in stripped):
+        spans = _brace_spans(stripped)
+    else:
+        spans = _indent_spans(lines)
+
+    regions = []
+    for start, end, nesting in spans:
+        block = stripped[start - 1 : end]
+        complexity = 1 + sum(len(_BRANCH_PATTERN.findall(line)) for line in block)
+        regions.append(
+            Region(_label(lines[start - 1]), start, end, nesting, complexity)
+        )
+    return regions
+
+
+def _brace_spans(stripped: List[str]) -> List[Tuple[int, int, int]]:
+    """Find top-level blocks, and the blocks directly inside classes and the like."""
+    blocks = []  # (start line, end line, base depth, nesting)
+    open_blocks: List[List[int]] = []  # [start line, base depth, deepest]
+    depth = 0
+    for number, line in enumerate(stripped, start=1):
+        for char in line:
+            if char == "{":
+                if depth <= 1:
+                    start = number
+                    # Allman style: the signature is on the line before the brace
+                    if line.strip() == "{" and number > 1:
+                        start = number - 1
+                    open_blocks.append([start, depth, depth])
+                depth += 1
+                if open_blocks:
+                    open_blocks[-1][2] = max(open_blocks[-1][2], depth)
+            elif char == "}" and depth > 0:
+                depth -= 1
+                if open_blocks and open_blocks[-1][1] == depth:
+                    start, base, deepest = open_blocks.pop()
+                    if open_blocks:
+                        open_blocks[-1][2] = max(open_blocks[-1][2], deepest)
+                    blocks.append((start, number, base, max(0, deepest - base - 1)))
+
+    containers = [
+        (start, end)
+        for start, end, base, _ in blocks
+        if base == 0 and _CONTAINER_PATTERN.search(stripped[start - 1])
+    ]
+    spans = []
+    for start, end, base, nesting in blocks:
+        if base == 0 and (start, end) not in containers:
+            spans.append((start, end, nesting))
+        elif base == 1 and any(s <= start and end <= e for s, e in containers):
+            spans.append((start, end, nesting))
+    return spans
+
+
+def _indent_spans(lines: List[str]) -> List[Tuple[int, int, int]]:
+    """Find blocks that start at the left margin and continue while indented."""
+    indents = [len(line) - len(line.lstrip()) for line in lines]
+    unit = min([indent for indent in indents if indent > 0] or [4])
+
+    spans = []
+    start = None
+    last = 0
+    deepest = 0
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        indent = indents[number - 1]
+        if indent == 0:
+            if start is not None:
+                spans.append((start, last, max(0, deepest // unit - 1)))
+            start, last, deepest = number, number, 0
+        elif start is not None:
+            last = number
+            deepest = max(deepest, indent)
+    if start is not None:
+        spans.append((start, last, max(0, deepest // unit - 1)))
+    return spans
+
+
+def _measure_duplication(lines: List[str], regions: List[Region]) -> None:
+    """Set each region's duplication to the share of its line windows seen twice."""
+    significant = [
+        (number, " ".join(line.split()))
+        for number, line in enumerate(lines, start=1)
+        if len(line.strip()) > 1
+    ]
+    # (first line, last line, normalized text) of each run of significant lines
+    windows: List[Tuple[int, int, str]] = [
+        (
+            significant[index][0],
+            significant[index + DUPLICATION_WINDOW - 1][0],
+            "\n".join(
+                text for _, text in significant[index : index + DUPLICATION_WINDOW]
+            ),
+        )
+        for index in range(len(significant) - DUPLICATION_WINDOW + 1)
+    ]
+    counts: Dict[str, int] = Counter(text for _, _, text in windows)
+
+    for region in regions:
+        inside = [
+            text
+            for first, last, text in windows
+            if region.start_line <= first and last <= region.end_line
+        ]
+        if inside:
+            region.duplication = sum(counts[text] > 1 for text in inside) / len(inside)
@@ -1,8 +1,12 @@
 """LLM provider implementations for Code Roaster."""
 
+import asyncio
 import os
+import queue
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from langchain.prompts import PromptTemplate
 from langchain_anthropic import ChatAnthropic
@@ -12,20 +16,86 @@ from langchain_openai import ChatOpenAI
 from code_roaster.config import Config
 
 
+# Sentinel placed on the chunk queue when the model has finished responding
+_STREAM_END = object()
+
+# How often a waiting roast re-checks its deadline and cancel event (seconds)
+_POLL_INTERVAL = 0.1
+
+# Event loop that drives async model streams, shared so pooled connections
+# always belong to the same loop
+_stream_loop: Optional[asyncio.AbstractEventLoop] = None
+_stream_loop_lock = threading.Lock()
+
+
+def _get_stream_loop() -> asyncio.AbstractEventLoop:
+    """Get the shared stream event loop, starting its thread on first use."""
+    global _stream_loop
+    with _stream_loop_lock:
+        if _stream_loop is None:
+            _stream_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_stream_loop.run_forever, name="code-roaster-streams", daemon=True
+            ).start()
+        return _stream_loop
+
+
+class RoastCancelled(Exception):
+    """Raised when an in-flight roast is cancelled by the caller."""
+
+
+class RoastDeadlineExceeded(Exception):
+    """Raised by stream_prompt when a roast runs past its deadline."""
+
+
+class RoastTimeout(str):
+    """Roast result returned when generation hits its deadline.
+
+    The value is the partial roast produced before the deadline, so it can be
+    displayed like any other roast; callers detect the timeout with
+    ``isinstance(result, RoastTimeout)``.
+    """
+
+    def __new__(cls, partial_roast: str, timeout: float):
+        result = super().__new__(cls, partial_roast)
+        result.timeout = timeout
+        return result
+
+
+class RoastFailed(str):
+    """Roast result returned when no roast could be generated at all.
+
+    The value describes the failure; callers detect it with
+    ``isinstance(result, RoastFailed)`` and show it as an error rather than
+    as a roast.
+    """
+
+
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
 
     def __init__(
-        self, api_endpoint: Optional[str] = None, model_name: Optional[str] = None
+        self,
+        api_endpoint: Optional[str] = None,
+        model_name: Optional[str] = None,
+        timeout: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        stop: Optional[List[str]] = None,
     ):
         """Initialize the LLM provider.
 
         Args:
             api_endpoint: Optional custom API endpoint
             model_name: Optional model name to use
+            timeout: Optional deadline in seconds for each roast
+            max_tokens: Optional cap on the number of output tokens
+            stop: Optional stop sequences that end generation early
         """
         self.api_endpoint = api_endpoint
         self.model_name = model_name
+        self.timeout = timeout
+        self.max_tokens = max_tokens
+        self.stop = list(stop) if stop else None
         self.llm = None
         self.initialize()
 
@@ -43,56 +113,244 @@ class LLMProvider(ABC):
         """Initialize the LLM client."""
         pass
 
-    def generate_roast(self, code_content: str, language: str) -> str:
+    def _limit_kwargs(
+        self,
+        timeout_key: Optional[str] = "timeout",
+        max_tokens_key: str = "max_tokens",
+        stop_key: str = "stop",
+    ) -> Dict[str, Any]:
+        """Build client keyword arguments for the configured generation limits.
+
+        Only limits that are set are included, so each client keeps its own
+        defaults otherwise.
+
+        Args:
+            timeout_key: Client argument name for the request timeout, or None
+                if the client takes its timeout some other way
+            max_tokens_key: Client argument name for the output token cap
+            stop_key: Client argument name for the stop sequences
+
+        Returns:
+            A dictionary of keyword arguments for the client constructor
+        """
+        kwargs: Dict[str, Any] = {}
+        if self.timeout is not None and timeout_key:
+            kwargs[timeout_key] = self.timeout
+        if self.max_tokens is not None:
+            kwargs[max_tokens_key] = self.max_tokens
+        if self.stop:
+            kwargs[stop_key] = self.stop
+        return kwargs
+
+    def generate_roast(
+        self,
+        code_content: str,
+        language: str,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> str:
         """Generate a roast for the given code content.
 
         Args:
             code_content: The code content to roast
             language: The programming language of the code
+            cancel_event: Optional event that aborts the roast when set
+
+        Returns:
+            The generated roast, a RoastTimeout holding the partial roast if
+            the deadline was reached, or a RoastFailed describing the error
+
+        Raises:
+            RoastCancelled: If cancel_event is set before the roast completes
+        """
+        prompt = self._create_prompt(code_content, language)
+        return self.generate(prompt, cancel_event=cancel_event)
+
+    def generate(
+        self, prompt: str, cancel_event: Optional[threading.Event] = None
+    ) -> str:
+        """Generate a complete response for a prompt.
+
+        Args:
+            prompt: The prompt to send
+            cancel_event: Optional event that aborts generation when set
 
         Returns:
-            The generated roast
+            The generated text, a RoastTimeout holding the partial text if
+            the deadline was reached, or a RoastFailed describing the error
+
+        Raises:
+            RoastCancelled: If cancel_event is set before generation completes
+        """
+        chunks = []
+        try:
+            for text in self.stream_prompt(prompt, cancel_event=cancel_event):
+                chunks.append(text)
+        except RoastDeadlineExceeded:
+            return RoastTimeout(''.join(chunks), self.timeout)
+        except RoastCancelled:
+            raise
+        except Exception as e:
+            # If there's an error during streaming or processing, convert it to a string
+            # This will include any CodeGate messages that might be in the error
+            return RoastFailed(str(e))
+        return ''.join(chunks)
+
+    def stream_prompt(
+        self,
+        prompt: str,
+        cancel_event: Optional[threading.Event] = None,
+        deadline: Optional[float] = None,
+    ) -> Iterator[str]:
+        """Stream the response to a prompt as text chunks.
+
+        The model is consumed in the background so that the deadline and
+        cancel event are honoured even while waiting on the network. Models
+        with async support are streamed on a shared event loop; when
+        iteration stops for any reason, the stream task is cancelled, which
+        closes the HTTP response at once even if the model has stalled.
+
+        Args:
+            prompt: The prompt to send
+            cancel_event: Optional event that aborts generation when set
+            deadline: Optional absolute time.monotonic() deadline; defaults to
+                now plus the provider timeout
+
+        Yields:
+            Non-empty text chunks in the order they arrive
+
+        Raises:
+            ValueError: If the LLM client is not initialized
+            RoastCancelled: If cancel_event is set before generation completes
+            RoastDeadlineExceeded: If the deadline passes before generation completes
         """
         if not self.llm:
             raise ValueError("LLM client not initialized")
 
-        prompt = self._create_prompt(code_content, language)
-        
+        if deadline is None and self.timeout is not None:
+            deadline = time.monotonic() + self.timeout
+        chunks: "queue.Queue[Any]" = queue.Queue()
+        if hasattr(self.llm, 'astream'):
+            future = asyncio.run_coroutine_threadsafe(
+                self._aproduce_chunks(prompt, chunks), _get_stream_loop()
+            )
+            stop_producer = future.cancel
+        else:
+            # Sync-only clients can only be stopped between chunks
+            stop = threading.Event()
+            threading.Thread(
+                target=self._produce_chunks, args=(prompt, chunks, stop), daemon=True
+            ).start()
+            stop_producer = stop.set
+
+        try:
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise RoastCancelled("Roast cancelled")
+                wait = _POLL_INTERVAL
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise RoastDeadlineExceeded("Roast exceeded its deadline")
+                    wait = min(wait, remaining)
+                try:
+                    item = chunks.get(timeout=wait)
+                except queue.Empty:
+                    continue
+                if item is _STREAM_END:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop_producer()
+
+    async def _aproduce_chunks(self, prompt: str, chunks: "queue.Queue[Any]") -> None:
+        """Read the model response into a queue using the async client.
+
+        Cancelling the task interrupts any pending network read and closes
+        the stream.
+
+        Args:
+            prompt: The prompt to send
+            chunks: Queue receiving text chunks, then an exception or _STREAM_END
+        """
+        try:
+            if hasattr(self.llm, 'streaming') and self.llm.streaming:
+                stream = self.llm.astream(prompt)
+                try:
+                    async for chunk in stream:
+                        text = self._chunk_text(chunk)
+                        if text:
+                            chunks.put(text)
+                finally:
+                    await stream.aclose()
+            else:
+                text = self._chunk_text(await self.llm.ainvoke(prompt))
+                if text:
+                    chunks.put(text)
+        except Exception as e:
+            chunks.put(e)
+        else:
+            chunks.put(_STREAM_END)
+
+    def _produce_chunks(
+        self, prompt: str, chunks: "queue.Queue[Any]", stop: threading.Event
+    ) -> None:
+        """Read the model response into a queue until finished or stopped.
+
+        Used for clients without async support.
+
+        Args:
+            prompt: The prompt to send
+            chunks: Queue receiving text chunks, then an exception or _STREAM_END
+            stop: Event set by the consumer when it no longer wants chunks
+        """
         try:
             # Check if the LLM is streaming
             if hasattr(self.llm, 'streaming') and self.llm.streaming:
-                # Handle streaming response
-                chunks = []
-                for chunk in self.llm.stream(prompt):
-                    if hasattr(chunk, 'content'):
-                        chunks.append(chunk.content)
-                    elif isinstance(chunk, str):
-                        chunks.append(chunk)
-                    else:
-                        # Try to extract content from other response types
-                        try:
-                            chunks.append(str(chunk))
-                        except:
-                            pass
-                return ''.join([c for c in chunks if c])
+                stream = self.llm.stream(prompt)
+                try:
+                    for chunk in stream:
+                        if stop.is_set():
+                            break
+                        text = self._chunk_text(chunk)
+                        if text:
+                            chunks.put(text)
+                finally:
+                    if hasattr(stream, 'close'):
+                        stream.close()
             else:
                 # Handle non-streaming response
-                response = self.llm.invoke(prompt)
-                
-                # Handle different response types
-                if hasattr(response, 'content'):
-                    # For ChatOllama and other chat models that return a message object
-                    return response.content
-                elif isinstance(response, str):
-                    # For models that return a string directly
-                    return response
-                else:
-                    # For other response types, convert to string
-                    return str(response)
+                text = self._chunk_text(self.llm.invoke(prompt))
+                if text:
+                    chunks.put(text)
         except Exception as e:
-            # If there's an error during streaming or processing, convert it to a string
-            # This will include any CodeGate messages that might be in the error
-            return str(e)
+            chunks.put(e)
+        else:
+            chunks.put(_STREAM_END)
+
+    @staticmethod
+    def _chunk_text(chunk: Any) -> str:
+        """Extract the text from a streamed chunk or a complete response.
+
+        Args:
+            chunk: A message chunk, message, string or other response object
+
+        Returns:
+            The text content, or an empty string if none could be extracted
+        """
+        if hasattr(chunk, 'content'):
+            # For ChatOllama and other chat models that return a message object
+            return chunk.content
+        elif isinstance(chunk, str):
+            # For models that return a string directly
+            return chunk
+        else:
+            # Try to extract content from other response types
+            try:
+                return str(chunk)
+            except Exception:
+                return ""
 
     def _create_prompt(self, code_content: str, language: str) -> str:
         """Create a prompt for the LLM.
@@ -121,6 +379,100 @@ Your response should be formatted as a cohesive roast, not a list of issues.
         prompt_template = PromptTemplate.from_template(template)
         return prompt_template.format(code_content=code_content, language=language)
 
+    def _create_hotspot_prompt(
+        self, excerpt: str, language: str, total_lines: int
+    ) -> str:
+        """Create a prompt for the LLM from the hotspots of a larger file.
+
+        Args:
+            excerpt: Line-numbered excerpts of the file's highest-scoring regions
+            language: The programming language of the code
+            total_lines: Number of lines in the whole file
+
+        Returns:
+            The formatted prompt
+        """
+        template = """
+You are a code roaster who provides lighthearted, PG-rated jokes about code.
+Below are the most tangled parts of a {total_lines}-line {language} file, picked by static analysis.
+Each excerpt starts with a comment giving its line range and metrics, and every line is prefixed with its line number.
+Analyze them and create a humorous roast focusing on code structure and patterns.
+Keep your comments funny but not mean-spirited.
+
+EXCERPTS:
+```{language}
+{excerpt}
+```
+
+Provide your roast with specific references to the code, citing line numbers. Be creative and funny, but keep it PG-rated.
+Focus on making general jokes about code structure and patterns.
+Your response should be formatted as a cohesive roast, not a list of issues.
+"""
+        prompt_template = PromptTemplate.from_template(template)
+        return prompt_template.format(
+            excerpt=excerpt, language=language, total_lines=total_lines
+        )
+
+    def _create_packed_prompt(self, files: List[Tuple[str, str, str]]) -> str:
+        """Create a prompt that roasts several small files in one request.
+
+        Args:
+            files: (file name, language, code content) for each file
+
+        Returns:
+            The formatted prompt
+        """
+        template = """
+You are a code roaster who provides lighthearted, PG-rated jokes about code.
+Analyze each of the following {count} files and create a separate humorous roast for each one, focusing on code structure and patterns.
+Keep your comments funny but not mean-spirited.
+
+{files}
+
+Provide each roast with specific references to its file. Be creative and funny, but keep it PG-rated.
+Focus on making general jokes about code structure and patterns.
+Each roast should be formatted as a cohesive roast, not a list of issues.
+Write the roasts in file order. Start each one with a line containing only its marker, from ===== ROAST 1 ===== to ===== ROAST {count} =====, and write nothing before the first marker.
+"""
+        sections = "\n\n".join(
+            f"===== FILE {index}: {name} =====\n```{language}\n{code_content}\n```"
+            for index, (name, language, code_content) in enumerate(files, start=1)
+        )
+        prompt_template = PromptTemplate.from_template(template)
+        return prompt_template.format(count=len(files), files=sections)
+
+    def _create_summary_prompt(
+        self, name: str, scope: str, child_roasts: List[Tuple[str, str]]
+    ) -> str:
+        """Create a prompt that combines existing roasts into one.
+
+        Args:
+            name: The name of the directory or repository being summarized
+            scope: What is being summarized, "directory" or "repository"
+            child_roasts: (child name, roast) pairs for the files and
+                subdirectories it contains
+
+        Returns:
+            The formatted prompt
+        """
+        template = """
+You are a code roaster who provides lighthearted, PG-rated jokes about code.
+Below are roasts you already wrote for each part of the {scope} "{name}".
+Combine them into a single roast of the whole {scope}, calling out the recurring
+habits and patterns that show up across its parts.
+Keep your comments funny but not mean-spirited.
+
+{roasts}
+
+Provide your roast with specific references to the parts above. Be creative and funny, but keep it PG-rated.
+Your response should be formatted as a cohesive roast, not a list of issues.
+"""
+        roasts = "\n\n".join(
+            f"ROAST OF {child_name}:\n{roast.strip()}" for child_name, roast in child_roasts
+        )
+        prompt_template = PromptTemplate.from_template(template)
+        return prompt_template.format(name=name, scope=scope, roasts=roasts)
+
 
 class OpenAIProvider(LLMProvider):
     """OpenAI LLM provider implementation."""
@@ -142,6 +494,7 @@ class OpenAIProvider(LLMProvider):
             model_name=model_name,
             temperature=0.7,
             streaming=True,  # Enable streaming for proxies that force streaming mode
+            **self._limit_kwargs(),
         )
 
 
@@ -165,6 +518,7 @@ class AnthropicProvider(LLMProvider):
             model_name=model_name,
             temperature=0.7,
             streaming=True,  # Enable streaming mode
+            **self._limit_kwargs(),
         )
 
 
@@ -178,11 +532,16 @@ class OllamaProvider(LLMProvider):
         # Update self.model_name with the actual model being used
         self.model_name = model_name
 
+        # Ollama takes its HTTP timeout through the underlying client options
+        client_kwargs = {"timeout": self.timeout} if self.timeout is not None else {}
+
         self.llm = ChatOllama(
             base_url=api_endpoint,
             model=model_name,
             temperature=0.7,
             streaming=True,  # Enable streaming mode
+            client_kwargs=client_kwargs,
+            **self._limit_kwargs(timeout_key=None, max_tokens_key="num_predict"),
         )
 
 
@@ -206,6 +565,7 @@ class OpenRouterProvider(LLMProvider):
             model_name=model_name,
             temperature=0.7,
             streaming=True,  # Enable streaming for proxies that force streaming mode
+            **self._limit_kwargs(),
         )
 
 
@@ -213,6 +573,9 @@ def get_provider(
     provider_name: str,
     api_endpoint: Optional[str] = None,
     model_name: Optional[str] = None,
+    timeout: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    stop: Optional[List[str]] = None,
 ) -> LLMProvider:
     """Get an LLM provider instance based on the provider name.
 
@@ -220,6 +583,9 @@ def get_provider(
         provider_name: The name of the LLM provider
         api_endpoint: Optional custom API endpoint
         model_name: Optional model name to use
+        timeout: Optional deadline in seconds for each roast
+        max_tokens: Optional cap on the number of output tokens
+        stop: Optional stop sequences that end generation early
 
     Returns:
         An instance of the specified LLM provider
@@ -234,8 +600,20 @@ def get_provider(
         "openrouter": OpenRouterProvider,
     }
 
+    if provider_name.lower() == "router":
+        # Imported here because the router module builds on this one
+        from code_roaster.router import RouterProvider
+
+        providers["router"] = RouterProvider
+
     provider_class = providers.get(provider_name.lower())
     if not provider_class:
         raise ValueError(f"Unsupported provider: {provider_name}")
 
-    return provider_class(api_endpoint=api_endpoint, model_name=model_name)
\ No newline at end of file
+    return provider_class(
+        api_endpoint=api_endpoint,
+        model_name=model_name,
+        timeout=timeout,
+        max_tokens=max_tokens,
+        stop=stop,
+    )
\ No newline at end of file
@@ -0,0 +1,296 @@
+"""Pack many small files into one roast request and split the response."""
+
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+from code_roaster.llm_providers import (
+    RoastCancelled,
+    RoastDeadlineExceeded,
+    RoastTimeout,
+)
+from code_roaster.roaster import CodeRoaster
+
+# Rough characters per token, used to estimate prompt sizes without a tokenizer
+CHARS_PER_TOKEN = 4
+
+# Upper bound on files per request, so each file still gets a decent roast
+MAX_FILES_PER_PACK = 10
+
+_MARKER_PATTERN = re.compile(r"^=+\s*ROAST\s+(\d+)\s*=+$")
+
+# Lines that mention a roast number and nothing else, such as "ROAST 2:"
+_MARKER_LIKE_PATTERN = re.compile(r"^\W*ROAST\s+\d+\W*$", re.IGNORECASE)
+
+# Markdown decoration models sometimes wrap around marker lines
+_MARKER_DECORATION = "#*_`> \t\r\n"
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a piece of text.
+
+    Args:
+        text: The text to measure
+
+    Returns:
+        The approximate token count
+    """
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+class PackedFile:
+    """A code file waiting to be roasted."""
+
+    def __init__(self, file_path: str, code_content: str, language: str):
+        self.file_path = file_path
+        self.code_content = code_content
+        self.language = language
+        self.tokens = estimate_tokens(code_content)
+
+
+class SectionSplitter:
+    """Split a streamed multi-file roast into per-file sections as it arrives.
+
+    Sections are delimited by marker lines such as ``===== ROAST 2 =====``,
+    optionally wrapped in markdown decoration like ``**`` or ``##``. A
+    section is reported once the next marker arrives, or when the stream is
+    closed for the last one. A section containing lines that look like
+    markers but do not parse probably swallowed other sections, so it is
+    dropped rather than reported.
+    """
+
+    def __init__(self, count: int, on_section: Callable[[int, str], None]):
+        """Initialize the splitter.
+
+        Args:
+            count: Number of sections expected
+            on_section: Callback receiving (1-based index, text) per section
+        """
+        self.count = count
+        self.on_section = on_section
+        self.completed: Dict[int, str] = {}
+        self._current: Optional[int] = None
+        self._parts: List[str] = []
+        self._line = ""
+
+    def feed(self, text: str) -> None:
+        """Feed the next chunk of the response.
+
+        Args:
+            text: The chunk text
+        """
+        self._line += text
+        while "\n" in self._line:
+            line, self._line = self._line.split("\n", 1)
+            self._handle_line(line + "\n")
+        # A partial line can only be held back if it might become a marker
+        partial = self._line.strip(_MARKER_DECORATION)
+        if partial and not partial.startswith("="):
+            self._append(self._line)
+            self._line = ""
+
+    def close(self, complete: bool = True) -> None:
+        """Finish the stream.
+
+        Args:
+            complete: Whether the stream ended normally; if not, the section
+                in progress is dropped because it may be cut off
+        """
+        if complete:
+            if self._line:
+                self._handle_line(self._line)
+            self._finish()
+        self._line = ""
+        self._current = None
+
+    def _handle_line(self, line: str) -> None:
+        match = _MARKER_PATTERN.match(line.strip(_MARKER_DECORATION))
+        if match and 1 <= int(match.group(1)) <= self.count:
+            self._finish()
+            self._current = int(match.group(1))
+        else:
+            self._append(line)
+
+    def _append(self, text: str) -> None:
+        # Text before the first marker is preamble and is ignored
+        if self._current is not None:
+            self._parts.append(text)
+
+    def _finish(self) -> None:
+        if self._current is not None:
+            text = "".join(self._parts).strip()
+            if any(
+                _MARKER_LIKE_PATTERN.match(line.strip(_MARKER_DECORATION))
+                for line in text.splitlines()
+            ):
+                text = ""
+            if text and self._current not in self.completed:
+                self.completed[self._current] = text
+                self.on_section(self._current, text)
+        self._parts = []
+
+
+class PackedRoaster:
+    """Roast many files, packing the small ones into shared requests.
+
+    Small files are grouped, up to a token budget, into one prompt with
+    per-file delimiters, and the streamed response is split back into a roast
+    per file. Files the response does not cover, or every file of a request
+    that fails, are retried with single-file requests.
+
+    When the provider has an output cap, files are not packed: the cap
+    applies to a whole response, so a packed response would almost always
+    be cut short and its files retried one by one anyway.
+    """
+
+    def __init__(
+        self,
+        roaster: CodeRoaster,
+        token_budget: int = 4000,
+        max_workers: int = 4,
+    ):
+        """Initialize the packed roaster.
+
+        Args:
+            roaster: The code roaster whose provider generates each roast
+            token_budget: Maximum estimated prompt tokens of code per packed request
+            max_workers: Maximum number of requests running at once
+        """
+        self.roaster = roaster
+        self.llm_provider = roaster.llm_provider
+        self.token_budget = token_budget
+        self.max_workers = max_workers
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def pack(self, files: Sequence[PackedFile]) -> List[List[PackedFile]]:
+        """Group files into requests.
+
+        Files larger than a quarter of the budget get a request of their
+        own; the rest are packed in order until the budget or the file limit
+        is reached. With an output cap, every file gets its own request.
+
+        Args:
+            files: The files to group
+
+        Returns:
+            The files for each request
+        """
+        if self.llm_provider.max_tokens is not None:
+            return [[packed_file] for packed_file in files]
+
+        small_limit = self.token_budget // 4
+        groups: List[List[PackedFile]] = []
+        current: List[PackedFile] = []
+        used = 0
+        for packed_file in files:
+            if packed_file.tokens > small_limit:
+                groups.append([packed_file])
+                continue
+            if current and (
+                used + packed_file.tokens > self.token_budget
+                or len(current) >= MAX_FILES_PER_PACK
+            ):
+                groups.append(current)
+                current, used = [], 0
+            current.append(packed_file)
+            used += packed_file.tokens
+        if current:
+            groups.append(current)
+        return groups
+
+    def roast_files(
+        self,
+        paths: Sequence[str],
+        on_result: Callable[[str, str, str, str], None],
+    ) -> None:
+        """Roast the code files under the given paths.
+
+        Args:
+            paths: Files and directories to roast
+            on_result: Callback receiving (file path, code content, roast,
+                language) for each file as soon as its roast is ready; it may
+                be called from worker threads, but never concurrently
+        """
+        files = []
+        for file_path in CodeRoaster.find_code_files(paths):
+            code_content = CodeRoaster.read_code_file(file_path)
+            language = CodeRoaster.detect_language(file_path)
+            files.append(PackedFile(file_path, code_content, language))
+
+        def report(packed_file: PackedFile, roast: str) -> None:
+            with self._lock:
+                on_result(
+                    packed_file.file_path,
+                    packed_file.code_content,
+                    roast,
+                    packed_file.language,
+                )
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self._roast_group, group, report)
+                for group in self.pack(files)
+            ]
+            for future in futures:
+                future.result()
+
+    def _roast_single(self, packed_file: PackedFile, report: Callable) -> None:
+        """Roast one file with its own request."""
+        self._count_request()
+        prompt = self.roaster.build_prompt(
+            packed_file.code_content, packed_file.language
+        )
+        report(packed_file, self.llm_provider.generate(prompt))
+
+    def _roast_group(self, group: List[PackedFile], report: Callable) -> None:
+        """Roast a group of files with one request, falling back per file."""
+        if len(group) == 1:
+            self._roast_single(group[0], report)
+            return
+
+        names = self._display_names(group)
+        prompt = self.llm_provider._create_packed_prompt(
+            [
+                (names[index], packed_file.language, packed_file.code_content)
+                for index, packed_file in enumerate(group)
+            ]
+        )
+        splitter = SectionSplitter(
+            len(group), lambda index, text: report(group[index - 1], text)
+        )
+
+        self._count_request()
+        try:
+            for text in self.llm_provider.stream_prompt(prompt):
+                splitter.feed(text)
+        except RoastCancelled:
+            raise
+        except RoastDeadlineExceeded:
+            # The budget is spent; retrying each file would only overrun it
+            splitter.close(complete=False)
+            for index, packed_file in enumerate(group, start=1):
+                if index not in splitter.completed:
+                    report(packed_file, RoastTimeout("", self.llm_provider.timeout))
+            return
+        except Exception:
+            splitter.close(complete=False)
+        else:
+            splitter.close()
+
+        for index, packed_file in enumerate(group, start=1):
+            if index not in splitter.completed:
+                self._roast_single(packed_file, report)
+
+    @staticmethod
+    def _display_names(group: List[PackedFile]) -> List[str]:
+        """Name files by their shortest unambiguous relative path."""
+        paths = [os.path.abspath(packed_file.file_path) for packed_file in group]
+        root = os.path.commonpath([os.path.dirname(path) for path in paths])
+        return [os.path.relpath(path, root) for path in paths]
+
+    def _count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
@@ -1,9 +1,11 @@
 """Core roasting functionality for Code Roaster."""
 
 import os
+import threading
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Iterable, List, Optional, Tuple
 
+from code_roaster.hotspots import build_hotspot_excerpt
 from code_roaster.llm_providers import LLMProvider
 
 
@@ -40,19 +42,65 @@ class CodeRoaster:
         ".dart": "dart",
     }
 
-    def __init__(self, llm_provider: LLMProvider):
+    def __init__(self, llm_provider: LLMProvider, hotspot_lines: Optional[int] = None):
         """Initialize the code roaster.
 
         Args:
             llm_provider: The LLM provider to use for roasting
+            hotspot_lines: If set, files longer than this many lines are sent
+                as excerpts of their highest-scoring regions instead of in full
         """
         self.llm_provider = llm_provider
+        self.hotspot_lines = hotspot_lines
 
-    def roast_code(self, file_path: str) -> Tuple[str, str, str]:
+    @classmethod
+    def is_supported_file(cls, file_path: str) -> bool:
+        """Check whether a file has an extension the roaster understands.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            True if the file extension is supported, False otherwise
+        """
+        _, ext = os.path.splitext(file_path.lower())
+        return ext in cls.LANGUAGE_EXTENSIONS
+
+    @classmethod
+    def find_code_files(cls, paths: Iterable[str]) -> List[str]:
+        """Expand files and directories into a sorted list of code files.
+
+        Files given explicitly are kept as-is; directories are walked
+        recursively, skipping hidden directories, and only files with a
+        supported extension are included.
+
+        Args:
+            paths: File and directory paths
+
+        Returns:
+            A sorted list of unique file paths
+        """
+        files = set()
+        for path in paths:
+            if os.path.isdir(path):
+                for dirpath, dirnames, filenames in os.walk(path):
+                    dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+                    for filename in filenames:
+                        full_path = os.path.join(dirpath, filename)
+                        if cls.is_supported_file(full_path):
+                            files.add(full_path)
+            else:
+                files.add(path)
+        return sorted(files)
+
+    def roast_code(
+        self, file_path: str, cancel_event: Optional[threading.Event] = None
+    ) -> Tuple[str, str, str]:
         """Roast the code in the specified file.
 
         Args:
             file_path: Path to the code file to roast
+            cancel_event: Optional event that aborts the roast when set
 
         Returns:
             A tuple containing (code_content, roast_content, language)
@@ -60,19 +108,43 @@ class CodeRoaster:
         Raises:
             FileNotFoundError: If the file does not exist
             ValueError: If the file type is not supported
+            RoastCancelled: If cancel_event is set while the roast is streaming
         """
         # Read the code file
-        code_content = self._read_code_file(file_path)
+        code_content = self.read_code_file(file_path)
 
         # Detect the programming language
-        language = self._detect_language(file_path)
+        language = self.detect_language(file_path)
 
         # Generate the roast
-        roast_content = self.llm_provider.generate_roast(code_content, language)
+        prompt = self.build_prompt(code_content, language)
+        roast_content = self.llm_provider.generate(prompt, cancel_event=cancel_event)
 
         return code_content, roast_content, language
 
-    def _read_code_file(self, file_path: str) -> str:
+    def build_prompt(self, code_content: str, language: str) -> str:
+        """Build the roast prompt for a file's content.
+
+        When hotspot selection is enabled and the file is over the line
+        budget, only its highest-scoring regions are included.
+
+        Args:
+            code_content: The code content to roast
+            language: The programming language of the code
+
+        Returns:
+            The prompt to send to the LLM
+        """
+        if self.hotspot_lines:
+            excerpt = build_hotspot_excerpt(code_content, language, self.hotspot_lines)
+            if excerpt:
+                return self.llm_provider._create_hotspot_prompt(
+                    excerpt, language, len(code_content.splitlines())
+                )
+        return self.llm_provider._create_prompt(code_content, language)
+
+    @staticmethod
+    def read_code_file(file_path: str) -> str:
         """Read the content of a code file.
 
         Args:
@@ -91,7 +163,8 @@ class CodeRoaster:
         with open(path, "r", encoding="utf-8") as file:
             return file.read()
 
-    def _detect_language(self, file_path: str) -> str:
+    @classmethod
+    def detect_language(cls, file_path: str) -> str:
         """Detect the programming language of a file based on its extension.
 
         Args:
@@ -104,12 +177,12 @@ class CodeRoaster:
             ValueError: If the file extension is not supported
         """
         _, ext = os.path.splitext(file_path.lower())
-        language = self.LANGUAGE_EXTENSIONS.get(ext)
+        language = cls.LANGUAGE_EXTENSIONS.get(ext)
 
         if not language:
             raise ValueError(
                 f"Unsupported file extension: {ext}. "
-                f"Supported extensions: {', '.join(self.LANGUAGE_EXTENSIONS.keys())}"
+                f"Supported extensions: {', '.join(cls.LANGUAGE_EXTENSIONS.keys())}"
             )
 
         return language
\ No newline at end of file
@@ -0,0 +1,316 @@
+"""Latency- and error-aware routing across several LLM providers."""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from code_roaster.config import Config
+from code_roaster.llm_providers import (
+    LLMProvider,
+    RoastCancelled,
+    RoastDeadlineExceeded,
+    RoastFailed,
+    RoastTimeout,
+    get_provider,
+)
+
+# Weight given to the newest sample in the moving averages
+EWMA_ALPHA = 0.3
+
+# A backend whose error rate reaches this level is considered unhealthy...
+UNHEALTHY_ERROR_RATE = 0.5
+
+# ...until this many seconds have passed since its last failure
+FAILURE_COOLDOWN = 60.0
+
+_EMPTY_STATS = {"latency": 0.0, "error_rate": 0.0, "samples": 0, "last_failure": 0.0}
+
+
+class RouterStats:
+    """EWMA latency and error-rate statistics per backend, persisted as JSON."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """Initialize the statistics store.
+
+        Args:
+            path: Optional JSON file to load from and save to; defaults to
+                router_stats.json in the cache directory
+        """
+        self.path = path or Config.get_cache_dir() / "router_stats.json"
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                self._stats = json.load(file)
+        except (OSError, ValueError):
+            self._stats = {}
+
+    def get(self, key: str) -> Dict[str, float]:
+        """Get the statistics for a backend.
+
+        Args:
+            key: The backend key, e.g. "openai:gpt-4o-mini"
+
+        Returns:
+            A dictionary with latency, error_rate, samples and last_failure
+        """
+        with self._lock:
+            return dict(self._stats.get(key, _EMPTY_STATS))
+
+    def record(self, key: str, latency: float, success: bool) -> None:
+        """Fold one roast attempt into a backend's statistics and save them.
+
+        Args:
+            key: The backend key
+            latency: Seconds the attempt took
+            success: False if the backend failed; attempts that completed or
+                ran into the caller's deadline count as successes
+        """
+        error = 0.0 if success else 1.0
+        with self._lock:
+            stats = dict(self._stats.get(key, _EMPTY_STATS))
+            if stats["samples"]:
+                stats["error_rate"] += EWMA_ALPHA * (error - stats["error_rate"])
+            else:
+                stats["error_rate"] = error
+
+            if not success:
+                stats["last_failure"] = time.time()
+            elif stats["latency"]:
+                stats["latency"] += EWMA_ALPHA * (latency - stats["latency"])
+            else:
+                stats["latency"] = latency
+            stats["samples"] += 1
+
+            self._stats[key] = stats
+            self._save()
+
+    def _save(self) -> None:
+        """Write the statistics to disk, ignoring failures."""
+        try:
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(self._stats, file, indent=2, sort_keys=True)
+            tmp_path.replace(self.path)
+        except OSError:
+            pass
+
+    def is_healthy(self, key: str) -> bool:
+        """Check whether a backend should be preferred for new roasts.
+
+        Args:
+            key: The backend key
+
+        Returns:
+            False if the backend is failing and still in its cooldown period
+        """
+        stats = self.get(key)
+        return (
+            stats["error_rate"] < UNHEALTHY_ERROR_RATE
+            or time.time() - stats["last_failure"] >= FAILURE_COOLDOWN
+        )
+
+    def score(self, key: str) -> float:
+        """Score a backend; lower is better.
+
+        The expected latency is inflated by the error rate, so a fast but
+        flaky backend can lose to a slower reliable one. Backends without
+        samples score zero so that they get tried.
+
+        Args:
+            key: The backend key
+
+        Returns:
+            The backend's score
+        """
+        stats = self.get(key)
+        return stats["latency"] / max(1.0 - stats["error_rate"], 0.05)
+
+
+def parse_backends(spec: str) -> List[Tuple[str, Optional[str]]]:
+    """Parse a comma-separated list of provider[:model] backends.
+
+    Args:
+        spec: The backend list, e.g. "openai:gpt-4o-mini,ollama"
+
+    Returns:
+        A list of (provider, model) tuples; model is None for the default
+
+    Raises:
+        ValueError: If the list is empty
+    """
+    backends = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        provider, _, model = item.partition(":")
+        backends.append((provider.strip().lower(), model.strip() or None))
+    if not backends:
+        raise ValueError("No router backends configured")
+    return backends
+
+
+class RouterProvider(LLMProvider):
+    """Provider that routes each roast to the best-scoring healthy backend.
+
+    Backends are tried in order of score, healthy ones first, and a failing
+    backend falls through to the next one. The model name is the list of
+    provider[:model] backends, taken from --model or ROUTER_MODEL.
+    """
+
+    def initialize(self) -> None:
+        """Initialize the backend providers and load their statistics."""
+        spec = Config.get_model("router", self.model_name)
+        self.backends: Dict[str, LLMProvider] = {}
+        failures = []
+        for provider_name, model_name in parse_backends(spec):
+            if provider_name == "router":
+                raise ValueError("The router cannot route to itself")
+            try:
+                backend = get_provider(
+                    provider_name=provider_name,
+                    api_endpoint=None,
+                    model_name=model_name,
+                    timeout=self.timeout,
+                    max_tokens=self.max_tokens,
+                    stop=self.stop,
+                )
+            except ValueError as e:
+                failures.append(f"{provider_name}: {e}")
+                continue
+            self.backends[f"{provider_name}:{backend.get_model_name}"] = backend
+
+        if not self.backends:
+            raise ValueError(
+                f"No router backends could be initialized ({'; '.join(failures)})"
+            )
+
+        self.model_name = ",".join(self.backends)
+        self.stats = RouterStats()
+        self.last_backend: Optional[str] = None
+
+    def rank_backends(self) -> List[str]:
+        """Order the backends from most to least preferred.
+
+        Returns:
+            Backend keys, healthy backends by score first, then unhealthy
+            backends by how long ago they last failed
+        """
+        keys = list(self.backends)
+        healthy = [key for key in keys if self.stats.is_healthy(key)]
+        unhealthy = [key for key in keys if key not in healthy]
+        healthy.sort(key=self.stats.score)
+        unhealthy.sort(key=lambda key: self.stats.get(key)["last_failure"])
+        return healthy + unhealthy
+
+    def _stream_backend(
+        self,
+        key: str,
+        prompt: str,
+        cancel_event: Optional[threading.Event],
+        deadline: Optional[float],
+    ) -> Iterator[str]:
+        """Stream from one backend, recording its latency and errors.
+
+        Running into the caller's deadline is not the backend's fault, so it
+        is recorded as a latency sample of the time spent, a lower bound on
+        the backend's real latency, rather than as an error.
+        """
+        started = time.monotonic()
+        try:
+            yield from self.backends[key].stream_prompt(
+                prompt, cancel_event=cancel_event, deadline=deadline
+            )
+        except RoastCancelled:
+            raise
+        except RoastDeadlineExceeded:
+            self.stats.record(key, time.monotonic() - started, success=True)
+            raise
+        except Exception:
+            self.stats.record(key, time.monotonic() - started, success=False)
+            raise
+        self.stats.record(key, time.monotonic() - started, success=True)
+        self.last_backend = key
+
+    def stream_prompt(
+        self,
+        prompt: str,
+        cancel_event: Optional[threading.Event] = None,
+        deadline: Optional[float] = None,
+    ) -> Iterator[str]:
+        """Stream the response from the best available backend.
+
+        Falls back to the next backend if one fails before producing any
+        output. The deadline covers all attempts together.
+
+        Args:
+            prompt: The prompt to send
+            cancel_event: Optional event that aborts generation when set
+            deadline: Optional absolute time.monotonic() deadline
+
+        Yields:
+            Non-empty text chunks in the order they arrive
+
+        Raises:
+            RoastCancelled: If cancel_event is set before generation completes
+            RoastDeadlineExceeded: If the deadline passes before generation completes
+            RuntimeError: If every backend fails
+        """
+        if deadline is None and self.timeout is not None:
+            deadline = time.monotonic() + self.timeout
+
+        failures = []
+        for key in self.rank_backends():
+            produced = False
+            try:
+                for text in self._stream_backend(key, prompt, cancel_event, deadline):
+                    produced = True
+                    yield text
+                return
+            except (RoastCancelled, RoastDeadlineExceeded):
+                raise
+            except Exception as e:
+                if produced:
+                    raise
+                failures.append(f"{key}: {e}")
+        raise RuntimeError("All router backends failed:\n" + "\n".join(failures))
+
+    def generate(
+        self, prompt: str, cancel_event: Optional[threading.Event] = None
+    ) -> str:
+        """Generate a complete response, falling back between backends.
+
+        Unlike stream_prompt, a backend that fails part-way through is also
+        retried on the next backend, since nothing has been shown yet.
+
+        Args:
+            prompt: The prompt to send
+            cancel_event: Optional event that aborts generation when set
+
+        Returns:
+            The generated text, a RoastTimeout holding the partial text if
+            the deadline was reached, or a RoastFailed describing every
+            backend's failure if none succeeded
+
+        Raises:
+            RoastCancelled: If cancel_event is set before generation completes
+        """
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+
+        failures = []
+        for key in self.rank_backends():
+            chunks = []
+            try:
+                for text in self._stream_backend(key, prompt, cancel_event, deadline):
+                    chunks.append(text)
+                return "".join(chunks)
+            except RoastDeadlineExceeded:
+                return RoastTimeout("".join(chunks), self.timeout)
+            except RoastCancelled:
+                raise
+            except Exception as e:
+                failures.append(f"{key}: {e}")
+        return RoastFailed("All router backends failed:\n" + "\n".join(failures))
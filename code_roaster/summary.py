@@ -0,0 +1,209 @@
+"""Repository-level roasts built hierarchically from per-file roasts."""
+
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Set
+
+from code_roaster.cache import ResultStore
+from code_roaster.roaster import CodeRoaster
+
+
+class RepoSummary:
+    """The outcome of a repository summary run."""
+
+    def __init__(self, root: str, roast: str, results: Dict[str, str]):
+        """Initialize the summary.
+
+        Args:
+            root: The repository root directory
+            roast: The repository-level roast
+            results: Roasts for every file and directory, keyed by path
+        """
+        self.root = root
+        self.roast = roast
+        self.results = results
+        self.computed = 0
+        self.reused = 0
+        self.failed = 0
+        # Paths without a roast: failed files, and directories none of
+        # whose children could be roasted
+        self.failures: Set[str] = set()
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the repository-level roast was produced."""
+        return self.root not in self.failures
+
+
+class RepoSummarizer:
+    """Roast a whole repository by reducing per-file roasts file → directory → repo.
+
+    Every file is roasted on its own, then each directory's file and
+    subdirectory roasts are combined into a directory roast, level by level,
+    up to a single roast for the repository. Roasts at the same level run in
+    parallel. Results are stored by the prompt that produced them, so a
+    repeat run only recomputes the files that changed and the directories
+    on the path from them to the root.
+    """
+
+    def __init__(
+        self,
+        roaster: CodeRoaster,
+        store: Optional[ResultStore] = None,
+        max_workers: int = 4,
+        progress: Optional[Callable[[str, bool], None]] = None,
+    ):
+        """Initialize the summarizer.
+
+        Args:
+            roaster: The code roaster whose provider generates each roast
+            store: Optional result store; defaults to the shared cache
+            max_workers: Maximum number of roasts running at once
+            progress: Optional callback receiving (path, reused) per roast
+        """
+        self.roaster = roaster
+        self.llm_provider = roaster.llm_provider
+        self.store = store or ResultStore()
+        self.max_workers = max_workers
+        self.progress = progress
+        self._lock = threading.Lock()
+
+    def summarize(self, paths: Sequence[str]) -> RepoSummary:
+        """Build a repository roast for the code files under the given paths.
+
+        Args:
+            paths: Files and directories making up the repository
+
+        Returns:
+            The repository summary
+
+        Raises:
+            ValueError: If no supported code files are found
+        """
+        files = [os.path.abspath(path) for path in CodeRoaster.find_code_files(paths)]
+        if not files:
+            raise ValueError("No supported code files found")
+
+        roots = [
+            (
+                os.path.abspath(path)
+                if os.path.isdir(path)
+                else os.path.dirname(os.path.abspath(path))
+            )
+            for path in paths
+        ]
+        root = os.path.commonpath(roots)
+
+        # Map every directory between the root and the files to its children
+        children: Dict[str, List[str]] = defaultdict(list)
+        for file_path in files:
+            child = file_path
+            parent = os.path.dirname(child)
+            while True:
+                if child not in children[parent]:
+                    children[parent].append(child)
+                if parent == root:
+                    break
+                child, parent = parent, os.path.dirname(parent)
+
+        summary = RepoSummary(root, "", {})
+
+        # Level 0: roast every file
+        self._run_level(summary, files, self._roast_file)
+
+        # Then reduce directories, deepest first, one depth level at a time
+        by_depth: Dict[int, List[str]] = defaultdict(list)
+        for directory in children:
+            by_depth[directory.count(os.sep)].append(directory)
+        for depth in sorted(by_depth, reverse=True):
+            self._run_level(
+                summary,
+                sorted(by_depth[depth]),
+                lambda directory: self._reduce_directory(
+                    summary, directory, sorted(children[directory]), directory == root
+                ),
+            )
+
+        summary.roast = summary.results[root]
+        return summary
+
+    def _run_level(
+        self, summary: RepoSummary, paths: List[str], roast: Callable[[str], tuple]
+    ) -> None:
+        """Run the roasts for one level in parallel and collect the results.
+
+        Each roast returns (text, status). The status is "computed", "reused"
+        or "failed" when the model was involved, "skipped" when there was
+        nothing to roast, or None when a child's roast was passed up.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for path, (text, status) in zip(paths, executor.map(roast, paths)):
+                summary.results[path] = text
+                if status in ("failed", "skipped"):
+                    summary.failures.add(path)
+                if status and status != "skipped":
+                    setattr(summary, status, getattr(summary, status) + 1)
+
+    def _roast_file(self, file_path: str) -> tuple:
+        """Roast one file, reusing a stored result when its content is unchanged."""
+        try:
+            code_content = CodeRoaster.read_code_file(file_path)
+            language = CodeRoaster.detect_language(file_path)
+        except (OSError, ValueError) as e:
+            return f"(could not be roasted: {e})", "failed"
+        prompt = self.roaster.build_prompt(code_content, language)
+        return self._complete(file_path, prompt)
+
+    def _reduce_directory(
+        self, summary: RepoSummary, directory: str, members: List[str], is_root: bool
+    ) -> tuple:
+        """Combine the roasts of a directory's children into one roast.
+
+        Children that failed are left out; if none succeeded, the directory
+        is marked failed without calling the model.
+        """
+        succeeded = [member for member in members if member not in summary.failures]
+        if len(members) == 1 and not is_root:
+            # Nothing to combine; pass the only child's roast straight up
+            return summary.results[members[0]], None if succeeded else "skipped"
+        if not succeeded:
+            return "(none of its contents could be roasted)", "skipped"
+
+        child_roasts = [
+            (os.path.relpath(member, summary.root), summary.results[member])
+            for member in succeeded
+        ]
+        name = os.path.basename(directory) or directory
+        scope = "repository" if is_root else "directory"
+        prompt = self.llm_provider._create_summary_prompt(name, scope, child_roasts)
+        return self._complete(directory, prompt)
+
+    def _complete(self, path: str, prompt: str) -> tuple:
+        """Generate a result for a prompt, or reuse the stored one.
+
+        Failed roasts are returned as a note and are not stored, so the next
+        run retries them.
+        """
+        key = self.store.key(self.llm_provider, prompt)
+        text = self.store.get(key)
+        if text is not None:
+            self._report(path, True)
+            return text, "reused"
+
+        try:
+            text = "".join(self.llm_provider.stream_prompt(prompt))
+        except Exception as e:
+            self._report(path, False)
+            return f"(roast failed: {e})", "failed"
+
+        self.store.put(key, text)
+        self._report(path, False)
+        return text, "computed"
+
+    def _report(self, path: str, reused: bool) -> None:
+        """Forward progress to the callback, one call at a time."""
+        if self.progress:
+            with self._lock:
+                self.progress(path, reused)
@@ -0,0 +1,457 @@
+"""Watch mode for Code Roaster: re-roast files whenever they are saved."""
+
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from code_roaster.formatters import TerminalFormatter
+from code_roaster.llm_providers import RoastCancelled, RoastFailed, RoastTimeout
+from code_roaster.roaster import CodeRoaster
+
+# inotify event masks (see inotify(7))
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def file_digest(file_path: str) -> Optional[str]:
+    """Compute the SHA-256 digest of a file's content.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        The hex digest, or None if the file cannot be read
+    """
+    try:
+        with open(file_path, "rb") as file:
+            return hashlib.sha256(file.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class FileWatcher(ABC):
+    """Abstract base class for watchers that report changed files."""
+
+    backend = "none"
+
+    def __init__(self, paths: Iterable[str], include: Callable[[str], bool]):
+        """Initialize the watcher.
+
+        Args:
+            paths: Files and directories to watch; directories are recursive
+            include: Predicate deciding which files inside directories to report
+        """
+        self.files = set()
+        self.directories = set()
+        for path in paths:
+            path = os.path.abspath(path)
+            if os.path.isdir(path):
+                self.directories.add(path)
+            else:
+                self.files.add(path)
+        self.include = include
+
+    def wants(self, file_path: str) -> bool:
+        """Check whether a changed path is one the caller asked to watch.
+
+        Args:
+            file_path: Absolute path of the changed file
+
+        Returns:
+            True if the change should be reported
+        """
+        if file_path in self.files:
+            return True
+        return any(
+            file_path.startswith(directory + os.sep) for directory in self.directories
+        ) and self.include(file_path)
+
+    @abstractmethod
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Block until at least one watched file changes or the timeout expires.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            The set of changed file paths (empty on timeout)
+        """
+        pass
+
+    def close(self) -> None:
+        """Release any resources held by the watcher."""
+
+
+class PollingWatcher(FileWatcher):
+    """Portable watcher that compares file modification times on an interval."""
+
+    backend = "polling"
+
+    def __init__(
+        self,
+        paths: Iterable[str],
+        include: Callable[[str], bool],
+        interval: float = 0.5,
+    ):
+        """Initialize the polling watcher.
+
+        Args:
+            paths: Files and directories to watch; directories are recursive
+            include: Predicate deciding which files inside directories to report
+            interval: Seconds between scans
+        """
+        super().__init__(paths, include)
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, tuple]:
+        """Take a snapshot of (mtime, size) for every watched file."""
+        snapshot = {}
+        candidates = set(self.files)
+        for directory in self.directories:
+            for dirpath, dirnames, filenames in os.walk(directory):
+                dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+                for filename in filenames:
+                    file_path = os.path.join(dirpath, filename)
+                    if self.include(file_path):
+                        candidates.add(file_path)
+        for file_path in candidates:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            snapshot[file_path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Block until at least one watched file changes or the timeout expires."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            changed = {
+                path
+                for path in set(snapshot) | set(self._snapshot)
+                if snapshot.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = snapshot
+            if changed:
+                return changed
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return set()
+                time.sleep(min(self.interval, remaining))
+            else:
+                time.sleep(self.interval)
+
+
+class InotifyWatcher(FileWatcher):
+    """Linux watcher backed by inotify, called through libc with ctypes."""
+
+    backend = "inotify"
+
+    def __init__(self, paths: Iterable[str], include: Callable[[str], bool]):
+        """Initialize the inotify watcher.
+
+        Args:
+            paths: Files and directories to watch; directories are recursive
+            include: Predicate deciding which files inside directories to report
+
+        Raises:
+            OSError: If inotify is not available on this system
+        """
+        super().__init__(paths, include)
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._watches: Dict[int, str] = {}
+
+        # Files are watched through their parent directory so that editors
+        # which save by writing a temp file and renaming it are still seen
+        try:
+            for file_path in self.files:
+                self._add_watch(os.path.dirname(file_path))
+            for directory in self.directories:
+                for dirpath, dirnames, _ in os.walk(directory):
+                    dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+                    self._add_watch(dirpath)
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, directory: str) -> None:
+        """Register an inotify watch on a directory."""
+        if directory in self._watches.values():
+            return
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), directory)
+        self._watches[wd] = directory
+
+    def _read_events(self) -> Set[str]:
+        """Drain pending inotify events and return the changed files."""
+        changed = set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            directory = self._watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, os.fsdecode(name))
+            if mask & _IN_ISDIR:
+                if mask & (_IN_CREATE | _IN_MOVED_TO) and any(
+                    path.startswith(d + os.sep) for d in self.directories
+                ):
+                    try:
+                        self._add_watch(path)
+                    except OSError:
+                        pass
+                continue
+            if self.wants(path):
+                changed.add(path)
+        return changed
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Block until at least one watched file changes or the timeout expires."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = (
+                None if deadline is None else max(0.0, deadline - time.monotonic())
+            )
+            readable, _, _ = select.select([self._fd], [], [], remaining)
+            if not readable:
+                return set()
+            changed = self._read_events()
+            if changed:
+                return changed
+
+    def close(self) -> None:
+        """Close the inotify file descriptor."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(
+    paths: Iterable[str],
+    include: Callable[[str], bool],
+    poll_interval: float = 0.5,
+) -> FileWatcher:
+    """Create the best available file watcher.
+
+    Uses inotify where the platform supports it and falls back to polling.
+
+    Args:
+        paths: Files and directories to watch
+        include: Predicate deciding which files inside directories to report
+        poll_interval: Seconds between scans when polling
+
+    Returns:
+        A FileWatcher instance
+    """
+    paths = list(paths)
+    try:
+        return InotifyWatcher(paths, include)
+    except (OSError, AttributeError):
+        return PollingWatcher(paths, include, interval=poll_interval)
+
+
+class _RoastJob:
+    """A roast running in a background thread for one file."""
+
+    def __init__(self, digest: Optional[str]):
+        self.digest = digest
+        self.cancel_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def is_alive(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+
+class RoastWatcher:
+    """Re-roast watched files on save, with debouncing and cancellation.
+
+    Bursts of change events for a file are collapsed until the file has been
+    quiet for ``debounce`` seconds. A new change to a file cancels its
+    in-flight roast immediately, and files whose content hash matches the
+    last completed roast are skipped.
+    """
+
+    def __init__(
+        self,
+        roaster: CodeRoaster,
+        formatter: TerminalFormatter,
+        paths: List[str],
+        debounce: float = 0.5,
+        watcher: Optional[FileWatcher] = None,
+    ):
+        """Initialize the roast watcher.
+
+        Args:
+            roaster: The code roaster used for each roast
+            formatter: The formatter used to display results
+            paths: Files and directories to watch
+            debounce: Seconds a file must be quiet before it is re-roasted
+            watcher: Optional file watcher; created automatically if omitted
+        """
+        self.roaster = roaster
+        self.formatter = formatter
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.debounce = debounce
+        self.watcher = watcher or create_watcher(
+            self.paths, CodeRoaster.is_supported_file
+        )
+        self._digests: Dict[str, Optional[str]] = {}
+        self._jobs: Dict[str, _RoastJob] = {}
+        self._pending: Dict[str, float] = {}
+        self._output_lock = threading.Lock()
+
+    def start(self) -> None:
+        """Roast explicitly named files and record a baseline for directories."""
+        for file_path in CodeRoaster.find_code_files(self.paths):
+            if file_path in self.watcher.files:
+                self._schedule(file_path)
+            else:
+                self._digests[file_path] = file_digest(file_path)
+
+    def poll(self, timeout: Optional[float] = None) -> None:
+        """Wait for changes once and start any roasts whose debounce expired.
+
+        Args:
+            timeout: Maximum seconds to wait when nothing is pending
+        """
+        if self._pending:
+            now = time.monotonic()
+            timeout = max(0.0, min(self._pending.values()) + self.debounce - now)
+        for file_path in self.watcher.wait(timeout):
+            self._on_change(file_path)
+
+        now = time.monotonic()
+        for file_path, last_event in list(self._pending.items()):
+            if now - last_event >= self.debounce:
+                del self._pending[file_path]
+                self._schedule(file_path)
+
+    def run(self) -> None:
+        """Watch until interrupted."""
+        self.formatter.display_info(
+            f"Watching {', '.join(self.paths)} ({self.watcher.backend}). "
+            "Press Ctrl-C to stop."
+        )
+        self.start()
+        try:
+            while True:
+                self.poll()
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """Cancel in-flight roasts and stop watching."""
+        for job in self._jobs.values():
+            job.cancel_event.set()
+        self.watcher.close()
+
+    def _on_change(self, file_path: str) -> None:
+        """Handle a single change event for a file."""
+        digest = file_digest(file_path)
+        job = self._jobs.get(file_path)
+        active = job is not None and job.is_alive()
+        if digest == (job.digest if active else self._digests.get(file_path)):
+            # Touched but not modified; nothing to do
+            return
+        if active:
+            job.cancel_event.set()
+        self._pending[file_path] = time.monotonic()
+
+    def _schedule(self, file_path: str) -> None:
+        """Start a roast for a file unless its content is unchanged."""
+        digest = file_digest(file_path)
+        if digest is None:
+            return
+        if digest == self._digests.get(file_path):
+            self.formatter.display_info(f"{file_path} is unchanged, skipping")
+            return
+
+        previous = self._jobs.get(file_path)
+        if previous is not None and previous.is_alive():
+            previous.cancel_event.set()
+
+        job = _RoastJob(digest)
+        job.thread = threading.Thread(
+            target=self._roast, args=(file_path, job), daemon=True
+        )
+        self._jobs[file_path] = job
+        job.thread.start()
+
+    def _roast(self, file_path: str, job: _RoastJob) -> None:
+        """Run a roast in a worker thread and display the result."""
+        try:
+            code_content, roast_content, language = self.roaster.roast_code(
+                file_path, cancel_event=job.cancel_event
+            )
+        except RoastCancelled:
+            with self._output_lock:
+                self.formatter.display_info(f"Cancelled stale roast of {file_path}")
+            return
+        except (FileNotFoundError, ValueError) as e:
+            with self._output_lock:
+                self.formatter.display_error(str(e))
+            return
+
+        if job.cancel_event.is_set():
+            return
+        if isinstance(roast_content, RoastFailed):
+            # Not recorded as roasted, so the next save retries it
+            with self._output_lock:
+                self.formatter.display_error(
+                    f"Roast of {file_path} failed: {roast_content}"
+                )
+            return
+        self._digests[file_path] = job.digest
+        with self._output_lock:
+            if isinstance(roast_content, RoastTimeout):
+                self.formatter.display_warning(
+                    f"Roast of {file_path} timed out after {roast_content.timeout:g}s, "
+                    "showing partial output"
+                )
+            self.formatter.format_roast(
+                code_content=code_content,
+                roast_content=roast_content,
+                language=language,
+                file_path=file_path,
+            )
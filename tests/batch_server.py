@@ -0,0 +1,195 @@
+"""Local stand-in for the OpenAI Batch and Anthropic Message Batches APIs."""
+
+import email
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+
+
+class BatchStandIn:
+    """An HTTP server implementing just enough of both batch APIs for tests.
+
+    Every request is answered with "Roast of <custom_id>", except prompts
+    containing FAIL_ME, which fail. A batch reports itself finished after
+    it has been polled ``polls_until_done`` times.
+    """
+
+    def __init__(self, polls_until_done: int = 1):
+        self.polls_until_done = polls_until_done
+        self.files = {}
+        self.batches = {}
+        self._ids = count(1)
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stand_in._handle(self, "GET")
+
+            def do_POST(self):
+                stand_in._handle(self, "POST")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+    @staticmethod
+    def _answer(custom_id, prompt):
+        if "FAIL_ME" in prompt:
+            return None
+        return f"Roast of {custom_id}"
+
+    def _poll(self, batch):
+        batch["polls"] += 1
+        return batch["polls"] >= self.polls_until_done
+
+    def _handle(self, handler, method):
+        body = handler.rfile.read(int(handler.headers.get("Content-Length") or 0))
+        path = handler.path
+        status, payload = 404, {"error": f"no route for {method} {path}"}
+
+        if method == "POST" and path == "/v1/files":
+            status, payload = self._upload(handler.headers["Content-Type"], body)
+        elif method == "POST" and path == "/v1/batches":
+            request = json.loads(body)
+            batch_id = f"batch_{next(self._ids)}"
+            self.batches[batch_id] = {
+                "kind": "openai",
+                "input": self.files[request["input_file_id"]],
+                "polls": 0,
+            }
+            status, payload = 200, {"id": batch_id, "status": "validating"}
+        elif method == "GET" and re.fullmatch(r"/v1/batches/\w+", path):
+            status, payload = self._openai_batch(path.rsplit("/", 1)[1])
+        elif method == "GET" and re.fullmatch(r"/v1/files/\w+/content", path):
+            handler.send_response(200)
+            handler.end_headers()
+            handler.wfile.write(self.files[path.split("/")[3]].encode("utf-8"))
+            return
+        elif method == "POST" and path == "/v1/messages/batches":
+            batch_id = f"msgbatch_{next(self._ids)}"
+            self.batches[batch_id] = {
+                "kind": "anthropic",
+                "requests": json.loads(body)["requests"],
+                "polls": 0,
+            }
+            status, payload = 200, {"id": batch_id, "processing_status": "in_progress"}
+        elif method == "GET" and re.fullmatch(r"/v1/messages/batches/\w+", path):
+            status, payload = self._anthropic_batch(path.rsplit("/", 1)[1])
+        elif method == "GET" and re.fullmatch(
+            r"/v1/messages/batches/\w+/results", path
+        ):
+            handler.send_response(200)
+            handler.end_headers()
+            handler.wfile.write(
+                self._anthropic_results(path.split("/")[4]).encode("utf-8")
+            )
+            return
+
+        data = json.dumps(payload).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def _upload(self, content_type, body):
+        message = email.message_from_bytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode("utf-8") + body
+        )
+        for part in message.get_payload():
+            if part.get_param("name", header="content-disposition") == "file":
+                file_id = f"file_{next(self._ids)}"
+                self.files[file_id] = part.get_payload(decode=True).decode("utf-8")
+                return 200, {"id": file_id}
+        return 400, {"error": "missing file"}
+
+    def _openai_batch(self, batch_id):
+        batch = self.batches[batch_id]
+        if not self._poll(batch):
+            return 200, {"id": batch_id, "status": "in_progress"}
+
+        if "output_file_id" not in batch:
+            output, errors = [], []
+            for line in batch["input"].splitlines():
+                request = json.loads(line)
+                custom_id = request["custom_id"]
+                answer = self._answer(
+                    custom_id, request["body"]["messages"][0]["content"]
+                )
+                if answer is None:
+                    errors.append(
+                        {
+                            "custom_id": custom_id,
+                            "response": {
+                                "status_code": 400,
+                                "body": {"error": {"message": "bad request"}},
+                            },
+                            "error": None,
+                        }
+                    )
+                else:
+                    output.append(
+                        {
+                            "custom_id": custom_id,
+                            "response": {
+                                "status_code": 200,
+                                "body": {"choices": [{"message": {"content": answer}}]},
+                            },
+                            "error": None,
+                        }
+                    )
+            for key, lines in (("output_file_id", output), ("error_file_id", errors)):
+                file_id = f"file_{next(self._ids)}"
+                self.files[file_id] = "\n".join(json.dumps(line) for line in lines)
+                batch[key] = file_id
+
+        return 200, {
+            "id": batch_id,
+            "status": "completed",
+            "output_file_id": batch["output_file_id"],
+            "error_file_id": batch["error_file_id"],
+        }
+
+    def _anthropic_batch(self, batch_id):
+        batch = self.batches[batch_id]
+        if not self._poll(batch):
+            return 200, {
+                "id": batch_id,
+                "processing_status": "in_progress",
+                "results_url": None,
+            }
+        return 200, {
+            "id": batch_id,
+            "processing_status": "ended",
+            "results_url": f"{self.base_url}/v1/messages/batches/{batch_id}/results",
+        }
+
+    def _anthropic_results(self, batch_id):
+        lines = []
+        for request in self.batches[batch_id]["requests"]:
+            custom_id = request["custom_id"]
+            answer = self._answer(
+                custom_id, request["params"]["messages"][0]["content"]
+            )
+            if answer is None:
+                result = {"type": "errored", "error": {"type": "invalid_request_error"}}
+            else:
+                result = {
+                    "type": "succeeded",
+                    "message": {"content": [{"type": "text", "text": answer}]},
+                }
+            lines.append(json.dumps({"custom_id": custom_id, "result": result}))
+        return "\n".join(lines)
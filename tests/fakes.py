@@ -0,0 +1,74 @@
+"""Offline stand-ins for LangChain chat models used across the tests."""
+
+import asyncio
+import time
+
+from code_roaster.llm_providers import LLMProvider
+
+
+class FakeLLM:
+    """Streaming stand-in for a LangChain chat model."""
+
+    streaming = True
+
+    def __init__(self, chunks, delay=0.0):
+        self.chunks = chunks
+        self.delay = delay
+        self.prompts = []
+        self.closed = False
+
+    def stream(self, prompt):
+        self.prompts.append(prompt)
+        try:
+            for chunk in self.chunks:
+                time.sleep(self.delay)
+                yield chunk
+        finally:
+            self.closed = True
+
+    async def astream(self, prompt):
+        self.prompts.append(prompt)
+        try:
+            for chunk in self.chunks:
+                await asyncio.sleep(self.delay)
+                yield chunk
+        finally:
+            self.closed = True
+
+
+class FakeProvider(LLMProvider):
+    """Provider that streams canned chunks instead of calling a model."""
+
+    def initialize(self) -> None:
+        self.model_name = self.model_name or "fake-model"
+        self.llm = FakeLLM(["Nice ", "code!"])
+
+
+class BrokenLLM:
+    """Chat model stand-in whose stream always fails."""
+
+    streaming = True
+
+    def __init__(self, error=None):
+        self.error = error or ConnectionError("endpoint down")
+
+    def stream(self, prompt):
+        raise self.error
+
+
+def fake_get_provider(provider_name, model_name=None, **kwargs):
+    """Stand-in for get_provider.
+
+    "missing" cannot be created, "broken" always fails, "slow" streams three
+    chunks 0.2s apart, and any other provider answers "roast from <name>".
+    """
+    if provider_name == "missing":
+        raise ValueError("missing API key")
+    provider = FakeProvider(model_name=model_name, timeout=kwargs.get("timeout"))
+    if provider_name == "broken":
+        provider.llm = BrokenLLM()
+    elif provider_name == "slow":
+        provider.llm = FakeLLM(["slow ", "roast ", "here"], delay=0.2)
+    else:
+        provider.llm = FakeLLM([f"roast from {provider_name}"], delay=0.01)
+    return provider
@@ -0,0 +1,139 @@
+"""Tests for the batch module."""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from code_roaster.batch import BatchJobStore, BatchRunner
+from code_roaster.cache import ResultStore
+from code_roaster.roaster import CodeRoaster
+from tests.batch_server import BatchStandIn
+from tests.fakes import FakeProvider
+
+
+class BatchRunnerTests:
+    """Submit/poll/collect tests run against each provider's batch API."""
+
+    provider_name = ""
+    endpoint_suffix = ""
+
+    def setUp(self):
+        """Create code files and a runner pointed at the stand-in server."""
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        (root / "src").mkdir()
+        (root / "src" / "good.py").write_text("x = 1\n")
+        (root / "src" / "bad.py").write_text("# FAIL_ME\n")
+        self.src = str(root / "src")
+
+        self.server = BatchStandIn(polls_until_done=3).__enter__()
+        self.env = patch.dict(
+            os.environ,
+            {
+                f"{self.provider_name.upper()}_API_KEY": "test_key",
+                f"{self.provider_name.upper()}_API_ENDPOINT": self.server.base_url
+                + self.endpoint_suffix,
+            },
+        )
+        self.env.start()
+
+        self.store = ResultStore(root / "results")
+        self.runner = BatchRunner(
+            CodeRoaster(FakeProvider(max_tokens=100)),
+            self.provider_name,
+            store=self.store,
+            jobs=BatchJobStore(root / "batches"),
+        )
+
+    def tearDown(self):
+        """Stop the server and clean up."""
+        self.env.stop()
+        self.server.__exit__(None, None, None)
+        self.tmp.cleanup()
+
+    def test_submit_poll_collect(self):
+        """Test the full workflow, including a failed request."""
+        submitted, stored, in_flight = self.runner.submit([self.src])
+        self.assertEqual(len(submitted), 1)
+        self.assertEqual((stored, in_flight), (0, 0))
+        job_id = submitted[0]["id"]
+
+        self.assertEqual(self.runner.poll()[0]["status"], "pending")
+        self.assertEqual(self.runner.collect([job_id]), [])
+
+        results = {
+            os.path.basename(file_path): (roast, error)
+            for file_path, _, roast, error in self.runner.collect()
+        }
+        self.assertEqual(results["good.py"][0][:9], "Roast of ")
+        self.assertIsNone(results["bad.py"][0])
+        self.assertIsNotNone(results["bad.py"][1])
+        self.assertEqual(self.runner.jobs.list(), [])
+
+    def test_stored_roasts_are_not_resubmitted(self):
+        """Test that collected roasts are reused and failures are retried."""
+        self.runner.submit([self.src])
+        self.runner.poll()
+        self.runner.poll()
+        self.runner.collect()
+
+        submitted, stored, _ = self.runner.submit([self.src])
+        self.assertEqual(stored, 1)
+        self.assertEqual(
+            [entry["file_path"] for entry in submitted[0]["requests"].values()],
+            [os.path.join(self.src, "bad.py")],
+        )
+
+    def test_pending_requests_are_not_resubmitted(self):
+        """Test that files waiting in a pending job are not submitted again."""
+        self.runner.submit([self.src])
+        submitted, stored, in_flight = self.runner.submit([self.src])
+        self.assertEqual(submitted, [])
+        self.assertEqual((stored, in_flight), (0, 2))
+        self.assertEqual(len(self.runner.jobs.list()), 1)
+
+    def test_jobs_use_their_recorded_endpoint(self):
+        """Test that poll and collect reach the endpoint a job was submitted to."""
+        submitted, _, _ = self.runner.submit([self.src])
+        with patch.dict(
+            os.environ,
+            {f"{self.provider_name.upper()}_API_ENDPOINT": "http://127.0.0.1:9"},
+        ):
+            runner = BatchRunner(
+                CodeRoaster(FakeProvider(max_tokens=100)),
+                self.provider_name,
+                store=self.store,
+                jobs=self.runner.jobs,
+            )
+            runner.poll()
+            runner.poll()
+            collected = runner.collect([submitted[0]["id"]])
+        self.assertEqual(len(collected), 2)
+
+
+class TestOpenAIBatch(BatchRunnerTests, unittest.TestCase):
+    """Batch tests against the OpenAI Batch API stand-in."""
+
+    provider_name = "openai"
+    endpoint_suffix = "/v1"
+
+
+class TestAnthropicBatch(BatchRunnerTests, unittest.TestCase):
+    """Batch tests against the Anthropic Message Batches stand-in."""
+
+    provider_name = "anthropic"
+
+
+class TestUnsupportedProvider(unittest.TestCase):
+    """Test cases for providers without a batch API."""
+
+    def test_ollama_is_rejected(self):
+        """Test that batch mode refuses providers without a batch API."""
+        with self.assertRaises(ValueError):
+            BatchRunner(CodeRoaster(FakeProvider()), "ollama")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""Tests for the cassette module."""
+
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from code_roaster.cassette import ReplayProvider, start_recording
+from code_roaster.llm_providers import RoastFailed
+from tests.fakes import FakeLLM, FakeProvider
+
+
+class TestRecordReplay(unittest.TestCase):
+    """Test cases for recording and replaying model streams."""
+
+    def setUp(self):
+        """Create a temporary cassette directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cassette_dir = self.tmp.name
+
+    def tearDown(self):
+        """Remove the cassette directory."""
+        self.tmp.cleanup()
+
+    def record(self, chunks, delay=0.0):
+        """Record one roast of a fixed snippet and return the live result."""
+        provider = FakeProvider(model_name="gpt-4o-mini")
+        provider.llm = FakeLLM(chunks, delay=delay)
+        start_recording(provider, self.cassette_dir)
+        return provider.generate_roast("x = 1", "python")
+
+    def replay_provider(self, **kwargs):
+        """Build a replay provider for the recorded model."""
+        return ReplayProvider(
+            provider_name="openai",
+            cassette_dir=self.cassette_dir,
+            model_name="gpt-4o-mini",
+            **kwargs,
+        )
+
+    def test_replay_matches_recording(self):
+        """Test that replay yields the same chunks as the live run."""
+        live = self.record(["Nice ", "code", "!"])
+        self.assertEqual(len(list(Path(self.cassette_dir).glob("*.json.gz"))), 1)
+
+        provider = self.replay_provider()
+        self.assertEqual(provider.generate_roast("x = 1", "python"), live)
+        prompt = provider._create_prompt("x = 1", "python")
+        self.assertEqual(list(provider.stream_prompt(prompt)), ["Nice ", "code", "!"])
+
+    def test_realtime_replay_keeps_timings(self):
+        """Test that recorded-speed replay reproduces the gaps between chunks."""
+        self.record(["a", "b", "c"], delay=0.05)
+
+        started = time.monotonic()
+        self.replay_provider(realtime=True).generate_roast("x = 1", "python")
+        self.assertGreaterEqual(time.monotonic() - started, 0.12)
+
+        started = time.monotonic()
+        self.replay_provider().generate_roast("x = 1", "python")
+        self.assertLess(time.monotonic() - started, 0.1)
+
+    def test_missing_cassette(self):
+        """Test that an unrecorded prompt is reported as a failure."""
+        roast = self.replay_provider().generate_roast("y = 2", "python")
+        self.assertIsInstance(roast, RoastFailed)
+        self.assertIn("No cassette recorded", roast)
+
+
+if __name__ == "__main__":
+    unittest.main()
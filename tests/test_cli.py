@@ -0,0 +1,58 @@
+"""Tests for the cli module."""
+
+import os
+import tempfile
+import unittest
+
+from click.testing import CliRunner
+
+from code_roaster.cli import main
+
+
+class TestModeOptions(unittest.TestCase):
+    """Test cases for combining mode options."""
+
+    def test_conflicting_modes_are_rejected(self):
+        """Test that two modes given together fail instead of one being ignored."""
+        result = CliRunner().invoke(
+            main, ["--summary", "--batch", "submit", "README.md"]
+        )
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("--summary, --batch cannot be used together", result.output)
+
+    def test_batch_rejects_cassettes(self):
+        """Test that batch mode refuses --record and --replay."""
+        with tempfile.TemporaryDirectory() as directory:
+            cassettes = os.path.join(directory, "cassettes")
+            os.mkdir(cassettes)
+            for option in ("--record", "--replay"):
+                result = CliRunner().invoke(
+                    main, ["--batch", "submit", option, cassettes, "README.md"]
+                )
+                self.assertEqual(result.exit_code, 1)
+                self.assertIn(
+                    "--batch cannot be used with --record or --replay", result.output
+                )
+
+    def test_router_rejects_api_endpoint(self):
+        """Test that the router refuses a single endpoint for all its backends."""
+        result = CliRunner().invoke(
+            main, ["-p", "router", "-e", "http://localhost:1234", "README.md"]
+        )
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("--api-endpoint cannot be used with the router", result.output)
+
+
+class TestNumericOptions(unittest.TestCase):
+    """Test cases for the ranges of numeric options."""
+
+    def test_out_of_range_values_are_rejected(self):
+        """Test that a zero timeout and a negative debounce are usage errors."""
+        for options in (["--timeout", "0"], ["--debounce", "-1"]):
+            result = CliRunner().invoke(main, options + ["README.md"])
+            self.assertEqual(result.exit_code, 2)
+            self.assertIn(options[0], result.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
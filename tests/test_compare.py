@@ -0,0 +1,103 @@
+"""Tests for the compare module."""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from code_roaster.compare import ModelComparison
+from tests.fakes import fake_get_provider
+
+
+class TestModelComparison(unittest.TestCase):
+    """Test cases for the ModelComparison class."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "example.py")
+        with open(self.file_path, "w", encoding="utf-8") as file:
+            file.write("print('hello')\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    @patch("code_roaster.compare.get_provider", side_effect=fake_get_provider)
+    def test_models_roast_concurrently(self, _):
+        """Test that every model streams its roast and gets a score."""
+        comparison = ModelComparison(["openai:gpt-4o,slow", "anthropic"])
+        comparison.run(self.file_path)
+
+        self.assertEqual(
+            comparison.snapshot(),
+            [
+                ("openai:gpt-4o", "roast from openai", "done"),
+                ("slow:fake-model", "slow roast here", "done"),
+                ("anthropic:fake-model", "roast from anthropic", "done"),
+            ],
+        )
+        scores = comparison.scorecard()
+        self.assertEqual(
+            [score["provider"] for score in scores], ["openai", "slow", "anthropic"]
+        )
+        slow = scores[1]
+        self.assertGreater(slow["total_time"], slow["time_to_first_token"])
+        self.assertGreater(slow["output_tokens"], 0)
+        self.assertGreater(slow["tokens_per_sec"], 0)
+        self.assertIsNone(slow["error"])
+        # The fast models finish while the slow one is still streaming
+        self.assertLess(scores[0]["total_time"], slow["total_time"])
+
+    @patch("code_roaster.compare.get_provider", side_effect=fake_get_provider)
+    def test_errors_are_recorded_per_model(self, _):
+        """Test that a failing model does not stop the others."""
+        comparison = ModelComparison(["broken", "missing", "openai"])
+        comparison.run(self.file_path)
+
+        scores = comparison.scorecard()
+        self.assertEqual(scores[0]["error"], "endpoint down")
+        self.assertEqual(scores[1]["error"], "missing API key")
+        self.assertIsNone(scores[1]["total_time"])
+        self.assertIsNone(scores[2]["error"])
+        self.assertEqual(comparison.snapshot()[0][2], "error")
+
+    @patch("code_roaster.compare.get_provider", side_effect=fake_get_provider)
+    def test_timeout_keeps_partial_roast(self, _):
+        """Test that a model past its deadline keeps what it streamed."""
+        comparison = ModelComparison(["slow"], timeout=0.3)
+        comparison.run(self.file_path)
+
+        label, text, status = comparison.snapshot()[0]
+        self.assertEqual(status, "error")
+        self.assertTrue(text.startswith("slow "))
+        self.assertEqual(comparison.scorecard()[0]["error"], "timed out after 0.3s")
+
+    @patch("code_roaster.compare.get_provider", side_effect=fake_get_provider)
+    def test_export_scorecard(self, _):
+        """Test that the scorecard is written as JSON."""
+        comparison = ModelComparison(["openai", "anthropic"])
+        comparison.run(self.file_path)
+        path = os.path.join(self.directory.name, "scorecard.json")
+        comparison.export_scorecard(path)
+
+        with open(path, encoding="utf-8") as file:
+            report = json.load(file)
+        self.assertEqual(report["file"], self.file_path)
+        self.assertEqual(report["language"], "python")
+        self.assertEqual(len(report["results"]), 2)
+        self.assertEqual(
+            set(report["results"][0]),
+            {
+                "provider",
+                "model",
+                "time_to_first_token",
+                "total_time",
+                "output_tokens",
+                "tokens_per_sec",
+                "error",
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""Tests for the hotspots module."""
+
+import unittest
+
+from code_roaster.hotspots import analyze, build_hotspot_excerpt, select_hotspots
+
+PYTHON_CODE = """
+def simple():
+    return 1
+
+
+def tangled(items):
+    total = 0
+    for item in items:
+        if item > 0:
+            while item:
+                if item % 2 and item > 3 or item == 7:
+                    total += item
+                item -= 1
+        elif item < 0:
+            total -= 1
+    return total
+
+
+class Thing:
+    def method(self):
+        x = 1
+        return x
+"""
+
+JAVA_CODE = """class Thing {
+    int simple() {
+        return 1;
+    }
+
+    int tangled(int x) {
+        if (x > 0) {
+            for (int i = 0; i < x; i--) {
+                if (i > 2 && x > 3) { x++; }
+            }
+        }
+        return x;
+    }
+}
+"""
+
+
+class TestAnalyze(unittest.TestCase):
+    """Test cases for region analysis."""
+
+    def test_python_metrics(self):
+        """Test nesting and complexity for Python functions."""
+        regions = {region.name: region for region in analyze(PYTHON_CODE, "python")}
+        self.assertEqual(
+            set(regions), {"function `tangled`", "function `Thing.method`"}
+        )
+        tangled = regions["function `tangled`"]
+        self.assertEqual((tangled.start_line, tangled.end_line), (6, 16))
+        # for > if > while > if; the elif does not add depth
+        self.assertEqual(tangled.nesting, 4)
+        # 1 + for + if + while + if + 2 bool ops + elif
+        self.assertEqual(tangled.complexity, 8)
+
+    def test_python_module_blocks(self):
+        """Test that module-level blocks are regions unless they define functions."""
+        code = (
+            "try:\n"
+            "    def helper():\n"
+            "        return 1\n"
+            "except ImportError:\n"
+            "    helper = None\n"
+            "\n"
+            'if __name__ == "__main__":\n'
+            "    for arg in args:\n"
+            "        if arg:\n"
+            "            print(arg)\n"
+        )
+        regions = analyze(code, "python")
+        self.assertEqual(
+            [region.name for region in regions],
+            ['block `if __name__ == "__main__":`'],
+        )
+        self.assertEqual((regions[0].start_line, regions[0].end_line), (7, 10))
+        self.assertEqual(regions[0].nesting, 2)
+
+    def test_brace_heuristic_finds_methods(self):
+        """Test that methods inside a class are found in brace languages."""
+        regions = analyze(JAVA_CODE, "java")
+        self.assertEqual([region.start_line for region in regions], [2, 6])
+        self.assertEqual(regions[1].nesting, 3)
+        self.assertEqual(regions[1].complexity, 5)
+
+    def test_duplication(self):
+        """Test that repeated blocks are reported as duplicated."""
+        block = (
+            "def f{n}():\n    a = compute()\n    b = compute(a)\n    return a + b\n\n"
+        )
+        code = block.format(n=1) + block.format(n=2)
+        for region in analyze(code, "python"):
+            self.assertEqual(region.duplication, 0.5)
+
+
+class TestSelection(unittest.TestCase):
+    """Test cases for hotspot selection."""
+
+    def test_selects_highest_score_within_budget(self):
+        """Test that the top region is chosen when the budget is tight."""
+        regions = select_hotspots(PYTHON_CODE, "python", max_lines=12)
+        self.assertEqual([region.name for region in regions], ["function `tangled`"])
+
+    def test_small_files_are_sent_whole(self):
+        """Test that no excerpt is built for files under the budget."""
+        self.assertIsNone(build_hotspot_excerpt(PYTHON_CODE, "python", max_lines=200))
+
+    def test_excerpt_has_line_numbers(self):
+        """Test that excerpts carry line references."""
+        excerpt = build_hotspot_excerpt(PYTHON_CODE, "python", max_lines=12)
+        self.assertIn("# Lines 6-16: function `tangled`", excerpt)
+        self.assertIn(" 6 | def tangled(items):", excerpt)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""Tests for the llm_providers module."""
+
+import os
+import time
+import unittest
+from unittest.mock import patch
+
+from code_roaster.llm_providers import (
+    _POLL_INTERVAL,
+    RoastFailed,
+    RoastTimeout,
+    get_provider,
+)
+from tests.fakes import BrokenLLM, FakeLLM, FakeProvider
+
+
+class TestGenerationLimits(unittest.TestCase):
+    """Test cases for deadlines and output caps."""
+
+    def test_generate_roast_completes(self):
+        """Test that a roast within its deadline returns the full text."""
+        provider = FakeProvider(timeout=5)
+        roast = provider.generate_roast("x = 1", "python")
+        self.assertEqual(roast, "Nice code!")
+        self.assertNotIsInstance(roast, RoastTimeout)
+
+    def test_deadline_returns_partial_timeout(self):
+        """Test that a slow roast returns a RoastTimeout with the partial text."""
+        provider = FakeProvider(timeout=0.2)
+        provider.llm = FakeLLM(["a"] + ["b"] * 50, delay=0.05)
+
+        started = time.monotonic()
+        roast = provider.generate_roast("x = 1", "python")
+
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertIsInstance(roast, RoastTimeout)
+        self.assertEqual(roast.timeout, 0.2)
+        self.assertTrue(roast.startswith("a"))
+
+    def test_deadline_closes_stalled_stream(self):
+        """Test that a stream stalled between chunks is closed at the deadline."""
+        provider = FakeProvider(timeout=0.3)
+        provider.llm = FakeLLM(["a", "b"], delay=2.0)
+
+        started = time.monotonic()
+        roast = provider.generate_roast("x = 1", "python")
+        self.assertIsInstance(roast, RoastTimeout)
+
+        while not provider.llm.closed and time.monotonic() - started < 2.0:
+            time.sleep(0.01)
+        self.assertTrue(provider.llm.closed)
+        self.assertLess(time.monotonic() - started, 0.3 + _POLL_INTERVAL)
+
+    def test_errors_are_returned_as_failures(self):
+        """Test that provider errors are returned as a RoastFailed with their text."""
+        provider = FakeProvider()
+        provider.llm = BrokenLLM(RuntimeError("blocked by gateway"))
+        roast = provider.generate_roast("x", "python")
+        self.assertIsInstance(roast, RoastFailed)
+        self.assertEqual(roast, "blocked by gateway")
+
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test_key"})
+    def test_limits_are_passed_to_client(self):
+        """Test that the limits reach the underlying LangChain client."""
+        provider = get_provider("openai", timeout=7, max_tokens=64, stop=["END"])
+        self.assertEqual(provider.llm.request_timeout, 7)
+        self.assertEqual(provider.llm.max_tokens, 64)
+        self.assertEqual(provider.llm.stop, ["END"])
+
+    def test_ollama_limits_use_ollama_names(self):
+        """Test that Ollama receives its output cap as num_predict."""
+        provider = get_provider("ollama", timeout=7, max_tokens=64)
+        self.assertEqual(provider.llm.num_predict, 64)
+        self.assertEqual(provider.llm.client_kwargs, {"timeout": 7})
+
+
+if __name__ == "__main__":
+    unittest.main()
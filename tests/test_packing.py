@@ -0,0 +1,154 @@
+"""Tests for the packing module."""
+
+import os
+import re
+import tempfile
+import unittest
+
+from code_roaster.packing import PackedFile, PackedRoaster, SectionSplitter
+from code_roaster.roaster import CodeRoaster
+from tests.fakes import FakeProvider
+
+
+class PackingLLM:
+    """Chat model stand-in that answers packed prompts section by section."""
+
+    streaming = True
+
+    def __init__(self, skip_sections=(), marker="===== ROAST {} ====="):
+        self.skip_sections = skip_sections
+        self.marker = marker
+        self.prompts = []
+
+    def stream(self, prompt):
+        self.prompts.append(prompt)
+        files = re.findall(r"===== FILE (\d+): (\S+) =====", prompt)
+        if files:
+            response = "Sure! Here are your roasts.\n"
+            for index, name in files:
+                if int(index) not in self.skip_sections:
+                    marker = self.marker.format(index)
+                    response += f"{marker}\nRoast of {name}\n"
+        else:
+            response = "Single roast"
+        # Stream in small pieces so markers are split across chunks
+        for offset in range(0, len(response), 3):
+            yield response[offset : offset + 3]
+
+
+class TestSectionSplitter(unittest.TestCase):
+    """Test cases for the SectionSplitter class."""
+
+    def test_splits_sections_as_they_arrive(self):
+        """Test that each section is reported when the next marker arrives."""
+        seen = []
+        splitter = SectionSplitter(2, lambda index, text: seen.append((index, text)))
+        for chunk in [
+            "intro\n=====",
+            " ROAST 1 ====",
+            "=\nfirst ",
+            "roast\n",
+            "===== ROAST 2 =====\n",
+        ]:
+            splitter.feed(chunk)
+        self.assertEqual(seen, [(1, "first roast")])
+
+        splitter.feed("second")
+        splitter.close()
+        self.assertEqual(seen, [(1, "first roast"), (2, "second")])
+
+    def test_incomplete_stream_drops_last_section(self):
+        """Test that a section cut off by an error is not reported."""
+        splitter = SectionSplitter(2, lambda index, text: None)
+        splitter.feed("===== ROAST 1 =====\nfull\n===== ROAST 2 =====\npart")
+        splitter.close(complete=False)
+        self.assertEqual(splitter.completed, {1: "full"})
+
+    def test_decorated_markers(self):
+        """Test that markers wrapped in markdown decoration still split sections."""
+        splitter = SectionSplitter(2, lambda index, text: None)
+        splitter.feed("**===== ROAST 1 =====**\nfirst\n## ===== ROAST 2 =====\nsecond")
+        splitter.close()
+        self.assertEqual(splitter.completed, {1: "first", 2: "second"})
+
+    def test_section_with_unparsed_markers_is_dropped(self):
+        """Test that a section that swallowed other sections is not reported."""
+        splitter = SectionSplitter(2, lambda index, text: None)
+        splitter.feed("===== ROAST 1 =====\nfirst\n--- ROAST 2 ---\nsecond")
+        splitter.close()
+        self.assertEqual(splitter.completed, {})
+
+
+class TestPackedRoaster(unittest.TestCase):
+    """Test cases for the PackedRoaster class."""
+
+    def setUp(self):
+        """Create small files and one large file."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.paths = []
+        for name in ["a.py", "b.py", "c.py"]:
+            path = os.path.join(self.tmp.name, name)
+            with open(path, "w") as file:
+                file.write("x = 1\n")
+            self.paths.append(path)
+        self.large = os.path.join(self.tmp.name, "large.py")
+        with open(self.large, "w") as file:
+            file.write("y = 2\n" * 400)
+
+    def tearDown(self):
+        """Remove the temporary files."""
+        self.tmp.cleanup()
+
+    def roast(self, llm, paths, max_tokens=None):
+        provider = FakeProvider(max_tokens=max_tokens)
+        provider.llm = llm
+        packer = PackedRoaster(CodeRoaster(provider), token_budget=1000)
+        results = {}
+        packer.roast_files(
+            paths, lambda path, code, roast, language: results.update({path: roast})
+        )
+        return packer, results
+
+    def test_small_files_share_a_request(self):
+        """Test that small files are packed and large files go alone."""
+        packer, results = self.roast(PackingLLM(), self.paths + [self.large])
+        self.assertEqual(packer.requests, 2)
+        self.assertEqual(results[self.paths[1]], "Roast of b.py")
+        self.assertEqual(results[self.large], "Single roast")
+
+    def test_missing_sections_fall_back_to_single_requests(self):
+        """Test that files missing from the response are roasted on their own."""
+        packer, results = self.roast(PackingLLM(skip_sections=(2,)), self.paths)
+        self.assertEqual(packer.requests, 2)
+        self.assertEqual(results[self.paths[0]], "Roast of a.py")
+        self.assertEqual(results[self.paths[1]], "Single roast")
+
+    def test_decorated_markers_are_split(self):
+        """Test that bold markers do not make one file swallow the others."""
+        packer, results = self.roast(
+            PackingLLM(marker="**===== ROAST {} =====**"), self.paths
+        )
+        self.assertEqual(packer.requests, 1)
+        self.assertEqual(results[self.paths[2]], "Roast of c.py")
+
+    def test_unparsed_markers_fall_back_for_the_group(self):
+        """Test that every file is re-requested when the markers cannot be split."""
+        packer, results = self.roast(PackingLLM(marker="ROAST {}:"), self.paths)
+        self.assertEqual(packer.requests, 4)
+        self.assertEqual(set(results.values()), {"Single roast"})
+
+    def test_output_cap_disables_packing(self):
+        """Test that files are roasted one per request when output is capped."""
+        packer, results = self.roast(PackingLLM(), self.paths, max_tokens=300)
+        self.assertEqual(packer.requests, 3)
+        self.assertEqual(results[self.paths[0]], "Single roast")
+
+    def test_pack_respects_budget(self):
+        """Test that groups stay within the token budget."""
+        packer = PackedRoaster(CodeRoaster(FakeProvider()), token_budget=100)
+        files = [PackedFile(f"{n}.py", "x" * 80, "python") for n in range(5)]
+        self.assertEqual([len(group) for group in packer.pack(files)], [4, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""Tests for the router module."""
+
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from code_roaster.llm_providers import RoastFailed, RoastTimeout
+from code_roaster.router import RouterProvider, RouterStats, parse_backends
+from tests.fakes import FakeLLM, fake_get_provider
+
+
+class TestRouterStats(unittest.TestCase):
+    """Test cases for the RouterStats class."""
+
+    def test_stats_persist_between_instances(self):
+        """Test that statistics are saved and reloaded."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "stats.json"
+            RouterStats(path).record("openai:gpt", 2.0, success=True)
+            stats = RouterStats(path).get("openai:gpt")
+            self.assertEqual(stats["latency"], 2.0)
+            self.assertEqual(stats["samples"], 1)
+
+    def test_failures_make_backend_unhealthy(self):
+        """Test that repeated failures mark a backend unhealthy."""
+        with tempfile.TemporaryDirectory() as directory:
+            stats = RouterStats(Path(directory) / "stats.json")
+            stats.record("ollama:llama3", 1.0, success=False)
+            self.assertFalse(stats.is_healthy("ollama:llama3"))
+            self.assertTrue(stats.is_healthy("openai:gpt"))
+
+    def test_concurrent_records_are_not_lost(self):
+        """Test that samples recorded from many threads are all counted."""
+        with tempfile.TemporaryDirectory() as directory:
+            stats = RouterStats(Path(directory) / "stats.json")
+            threads = [
+                threading.Thread(
+                    target=lambda: [
+                        stats.record("openai:gpt", 1.0, True) for _ in range(20)
+                    ]
+                )
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(stats.get("openai:gpt")["samples"], 160)
+
+    def test_parse_backends(self):
+        """Test parsing of provider[:model] lists."""
+        self.assertEqual(
+            parse_backends("openai:gpt-4o, ollama"),
+            [("openai", "gpt-4o"), ("ollama", None)],
+        )
+        with self.assertRaises(ValueError):
+            parse_backends(" , ")
+
+
+@patch("code_roaster.router.get_provider", fake_get_provider)
+class TestRouterProvider(unittest.TestCase):
+    """Test cases for the RouterProvider class."""
+
+    def setUp(self):
+        """Point the cache directory at a temporary location."""
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.env = patch.dict(
+            os.environ, {"CODE_ROASTER_CACHE_DIR": self.cache_dir.name}
+        )
+        self.env.start()
+
+    def tearDown(self):
+        """Clean up the temporary cache directory."""
+        self.env.stop()
+        self.cache_dir.cleanup()
+
+    def test_falls_back_on_failure(self):
+        """Test that a failing backend falls through to the next one."""
+        router = RouterProvider(model_name="broken:a,good:b")
+        self.assertEqual(router.generate_roast("x = 1", "python"), "roast from good")
+        self.assertEqual(router.last_backend, "good:b")
+
+    def test_unhealthy_backend_is_ranked_last(self):
+        """Test that a recently failed backend is tried after healthy ones."""
+        RouterProvider(model_name="broken:a,good:b").generate_roast("x", "python")
+        router = RouterProvider(model_name="broken:a,good:b")
+        self.assertEqual(router.rank_backends(), ["good:b", "broken:a"])
+
+    def test_all_backends_failing(self):
+        """Test that a typed failure is returned when every backend fails."""
+        router = RouterProvider(model_name="broken:a,broken:b")
+        roast = router.generate_roast("x", "python")
+        self.assertIsInstance(roast, RoastFailed)
+        self.assertIn("endpoint down", roast)
+
+    def test_deadline_is_not_a_backend_error(self):
+        """Test that hitting the caller's deadline keeps the backend healthy."""
+        router = RouterProvider(model_name="good:a", timeout=0.1)
+        router.backends["good:a"].llm = FakeLLM(["slow"] * 10, delay=0.05)
+
+        self.assertIsInstance(router.generate_roast("x", "python"), RoastTimeout)
+        stats = router.stats.get("good:a")
+        self.assertEqual(stats["error_rate"], 0.0)
+        self.assertGreaterEqual(stats["latency"], 0.1)
+        self.assertTrue(router.stats.is_healthy("good:a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
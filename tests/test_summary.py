@@ -0,0 +1,107 @@
+"""Tests for the summary module."""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from code_roaster.cache import ResultStore
+from code_roaster.roaster import CodeRoaster
+from code_roaster.summary import RepoSummarizer
+from tests.fakes import FakeProvider
+
+
+class CountingLLM:
+    """Chat model stand-in that numbers its responses."""
+
+    streaming = True
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.calls = 0
+        self.prompts = []
+
+    def stream(self, prompt):
+        self.calls += 1
+        self.prompts.append(prompt)
+        if self.fail_on is not None and self.fail_on in prompt:
+            raise ConnectionError("endpoint down")
+        yield f"roast #{self.calls}"
+
+
+class TestRepoSummarizer(unittest.TestCase):
+    """Test cases for the RepoSummarizer class."""
+
+    def setUp(self):
+        """Create a small repository and a summarizer with a private store."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        for rel_path in ["main.py", "pkg/a.py", "pkg/b.py", "docs/readme.md"]:
+            path = os.path.join(self.root, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as file:
+                file.write(f"# {rel_path}\n")
+
+        provider = FakeProvider()
+        self.llm = provider.llm = CountingLLM()
+        self.summarizer = RepoSummarizer(
+            CodeRoaster(provider), store=ResultStore(Path(self.root) / ".cache")
+        )
+
+    def tearDown(self):
+        """Remove the temporary repository."""
+        self.tmp.cleanup()
+
+    def test_builds_repository_roast(self):
+        """Test that files, multi-file directories and the root are roasted."""
+        summary = self.summarizer.summarize([self.root])
+
+        # 4 files + pkg + root; docs has one file and is passed through
+        self.assertEqual(summary.computed, 6)
+        self.assertEqual(self.llm.calls, 6)
+        self.assertEqual(summary.roast, summary.results[self.root])
+        self.assertEqual(
+            summary.results[os.path.join(self.root, "docs")],
+            summary.results[os.path.join(self.root, "docs", "readme.md")],
+        )
+
+    def test_repeat_run_reuses_unchanged_branches(self):
+        """Test that only changed files and their ancestors are recomputed."""
+        self.summarizer.summarize([self.root])
+        summary = self.summarizer.summarize([self.root])
+        self.assertEqual(summary.computed, 0)
+
+        with open(os.path.join(self.root, "pkg", "a.py"), "w") as file:
+            file.write("x = 1\n")
+        summary = self.summarizer.summarize([self.root])
+
+        # pkg/a.py, pkg and the root
+        self.assertEqual(summary.computed, 3)
+        self.assertEqual(summary.reused, 3)
+
+    def test_failed_children_are_left_out(self):
+        """Test that a failed file is not passed to its directory's roast."""
+        self.llm.fail_on = "# pkg/a.py"
+        summary = self.summarizer.summarize([self.root])
+
+        self.assertEqual(summary.failed, 1)
+        self.assertTrue(summary.succeeded)
+        pkg_prompt = self.llm.prompts[-2]
+        self.assertIn("pkg/b.py", pkg_prompt)
+        self.assertNotIn("pkg/a.py", pkg_prompt)
+        self.assertNotIn("roast failed", pkg_prompt)
+
+    def test_nothing_to_combine_skips_the_model(self):
+        """Test that directories without any successful child are not reduced."""
+        self.llm.fail_on = ""
+        summary = self.summarizer.summarize([self.root])
+
+        # Only the 4 files are attempted
+        self.assertEqual(self.llm.calls, 4)
+        self.assertEqual(summary.failed, 4)
+        self.assertFalse(summary.succeeded)
+        self.assertIn(os.path.join(self.root, "pkg"), summary.failures)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,229 @@
+"""Tests for the watcher module."""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from code_roaster.llm_providers import RoastCancelled
+from code_roaster.roaster import CodeRoaster
+from code_roaster.watcher import (
+    FileWatcher,
+    InotifyWatcher,
+    PollingWatcher,
+    RoastWatcher,
+)
+from tests.fakes import BrokenLLM, FakeLLM, FakeProvider
+
+
+class ScriptedWatcher(FileWatcher):
+    """Watcher that reports a scripted sequence of changes, one set per wait."""
+
+    backend = "scripted"
+
+    def __init__(self, paths, script):
+        super().__init__(paths, CodeRoaster.is_supported_file)
+        self.script = list(script)
+
+    def wait(self, timeout=None):
+        if self.script:
+            return self.script.pop(0)
+        time.sleep(timeout or 0)
+        return set()
+
+
+def write(file_path, content):
+    with open(file_path, "w") as file:
+        file.write(content)
+
+
+class TestPollingWatcher(unittest.TestCase):
+    """Test cases for the PollingWatcher class."""
+
+    def test_reports_modified_file(self):
+        """Test that a modified file inside a directory is reported."""
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "a.py")
+            with open(file_path, "w") as file:
+                file.write("x = 1\n")
+            watcher = PollingWatcher([directory], CodeRoaster.is_supported_file, 0.01)
+
+            with open(file_path, "w") as file:
+                file.write("x = 22\n")
+            self.assertEqual(watcher.wait(timeout=1.0), {file_path})
+
+    def test_ignores_unsupported_files(self):
+        """Test that files with unsupported extensions are not reported."""
+        with tempfile.TemporaryDirectory() as directory:
+            watcher = PollingWatcher([directory], CodeRoaster.is_supported_file, 0.01)
+            with open(os.path.join(directory, "notes.txt"), "w") as file:
+                file.write("hello")
+            self.assertEqual(watcher.wait(timeout=0.05), set())
+
+
+class TestInotifyWatcher(unittest.TestCase):
+    """Test cases for the InotifyWatcher class."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        try:
+            self.watcher = InotifyWatcher(
+                [self.directory.name], CodeRoaster.is_supported_file
+            )
+        except (OSError, AttributeError):
+            self.directory.cleanup()
+            self.skipTest("inotify is not available")
+
+    def tearDown(self):
+        self.watcher.close()
+        self.directory.cleanup()
+
+    def test_reports_saved_file(self):
+        """Test that writing a file is reported and unsupported files are not."""
+        file_path = os.path.join(self.directory.name, "a.py")
+        write(os.path.join(self.directory.name, "notes.txt"), "hello")
+        write(file_path, "x = 1\n")
+        self.assertEqual(self.watcher.wait(timeout=1.0), {file_path})
+        self.assertEqual(self.watcher.wait(timeout=0.05), set())
+
+    def test_watches_new_subdirectories(self):
+        """Test that files in directories created after start are reported."""
+        subdirectory = os.path.join(self.directory.name, "pkg")
+        os.mkdir(subdirectory)
+        self.assertEqual(self.watcher.wait(timeout=0.05), set())
+
+        file_path = os.path.join(subdirectory, "b.py")
+        write(file_path, "y = 2\n")
+        self.assertEqual(self.watcher.wait(timeout=1.0), {file_path})
+
+
+class TestRoastWatcher(unittest.TestCase):
+    """Test cases for the RoastWatcher class."""
+
+    def test_unchanged_content_is_skipped(self):
+        """Test that a file is not re-roasted when its hash is unchanged."""
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "a.py")
+            with open(file_path, "w") as file:
+                file.write("x = 1\n")
+            roaster = CodeRoaster(FakeProvider())
+            formatter = MagicMock()
+            watcher = RoastWatcher(
+                roaster, formatter, [file_path], watcher=MagicMock(files={file_path})
+            )
+
+            watcher.start()
+            watcher._jobs[file_path].thread.join()
+            watcher._schedule(file_path)
+
+            formatter.format_roast.assert_called_once()
+            self.assertEqual(
+                formatter.format_roast.call_args[1]["roast_content"], "Nice code!"
+            )
+
+    def test_failed_roast_is_retried(self):
+        """Test that a failed roast is shown as an error and not recorded."""
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "a.py")
+            write(file_path, "x = 1\n")
+            provider = FakeProvider()
+            provider.llm = BrokenLLM()
+            formatter = MagicMock()
+            watcher = RoastWatcher(
+                CodeRoaster(provider), formatter, [file_path], watcher=MagicMock()
+            )
+
+            for _ in range(2):
+                watcher._schedule(file_path)
+                watcher._jobs[file_path].thread.join()
+
+            formatter.format_roast.assert_not_called()
+            self.assertEqual(formatter.display_error.call_count, 2)
+
+    def test_burst_of_changes_is_debounced(self):
+        """Test that repeated changes within the debounce window roast once."""
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "a.py")
+            write(file_path, "x = 1\n")
+            formatter = MagicMock()
+            watcher = RoastWatcher(
+                CodeRoaster(FakeProvider()),
+                formatter,
+                [directory],
+                debounce=0.1,
+                watcher=ScriptedWatcher([directory], [{file_path}, {file_path}]),
+            )
+
+            watcher.poll()
+            write(file_path, "x = 2\n")
+            watcher.poll()
+            self.assertEqual(watcher._jobs, {})
+
+            watcher.poll()
+            watcher._jobs[file_path].thread.join()
+            formatter.format_roast.assert_called_once()
+            self.assertEqual(
+                formatter.format_roast.call_args[1]["code_content"], "x = 2\n"
+            )
+
+    def test_new_change_cancels_in_flight_roast(self):
+        """Test that a change during a roast cancels it and only the latest is shown."""
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "a.py")
+            write(file_path, "x = 1\n")
+            provider = FakeProvider()
+            provider.llm = FakeLLM(["slow "] * 10, delay=0.03)
+            formatter = MagicMock()
+            watcher = RoastWatcher(
+                CodeRoaster(provider),
+                formatter,
+                [directory],
+                debounce=0,
+                watcher=ScriptedWatcher([directory], [{file_path}, {file_path}]),
+            )
+
+            watcher.poll()
+            first = watcher._jobs[file_path]
+            time.sleep(0.05)
+            write(file_path, "x = 2\n")
+            watcher.poll()
+            second = watcher._jobs[file_path]
+
+            self.assertIsNot(first, second)
+            self.assertTrue(first.cancel_event.is_set())
+            first.thread.join()
+            second.thread.join()
+            formatter.format_roast.assert_called_once()
+            self.assertEqual(
+                formatter.format_roast.call_args[1]["code_content"], "x = 2\n"
+            )
+            formatter.display_info.assert_any_call(
+                f"Cancelled stale roast of {file_path}"
+            )
+
+
+class TestCancellation(unittest.TestCase):
+    """Test cases for cancelling a streaming roast."""
+
+    def test_cancel_event_closes_stream(self):
+        """Test that setting the cancel event aborts and closes the stream."""
+        provider = FakeProvider()
+        provider.llm = FakeLLM(["a"] * 100, delay=0.01)
+        cancel_event = threading.Event()
+        threading.Timer(0.05, cancel_event.set).start()
+
+        with self.assertRaises(RoastCancelled):
+            provider.generate_roast("x = 1", "python", cancel_event=cancel_event)
+
+        # The stream task is cancelled on the shared event loop thread
+        for _ in range(100):
+            if provider.llm.closed:
+                break
+            time.sleep(0.01)
+        self.assertTrue(provider.llm.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()